@@ -0,0 +1 @@
+"""Performance benchmarks for gedcom7, run as scripts rather than by pytest."""
@@ -0,0 +1,116 @@
+"""Datasets and timing helpers shared by the benchmarks."""
+
+from __future__ import annotations
+
+import pathlib
+import re
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+MAXIMAL = pathlib.Path(__file__).parent.parent / "test" / "data" / "maximal70.ged"
+
+_XREF = re.compile(r"(?m)^(0 )@([A-Z0-9_]+)@ ")
+_POINTER = re.compile(r"(?m) @(?!VOID@)([A-Z0-9_]+)@$")
+
+
+def scaled_maximal(copies: int) -> str:
+    """Repeat the records of maximal70.ged, renaming the xrefs of each copy.
+
+    The header and trailer appear once. The records in between are repeated,
+    every copy after the first with its cross-reference identifiers and the
+    pointers to them suffixed by the copy's number -- the header's own pointers
+    go to the first -- so the result is one valid dataset ``copies`` times as
+    long.
+    """
+    text = MAXIMAL.read_text(encoding="utf-8")
+    start = text.index("\n0 @") + 1
+    end = text.index("0 TRLR")
+    head, body, trailer = text[:start], text[start:end], text[end:]
+    parts = [head, body]
+    for copy in range(1, copies):
+        renamed = _XREF.sub(rf"\g<1>@\g<2>_{copy}@ ", body)
+        parts.append(_POINTER.sub(rf" @\g<1>_{copy}@", renamed))
+    parts.append(trailer)
+    return "".join(parts)
+
+
+_GIVEN = ("Anna", "Johann", "Maria", "Peter", "Elisabeth", "Georg", "Katharina")
+_SURNAMES = ("Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer")
+_PLACES = ("Berlin, Germany", "Hamburg, Germany", "Wien, Austria", "Bern, Switzerland")
+_SOURCES = 100
+
+
+def synthetic(individuals: int) -> str:
+    """Make a dataset of ``individuals`` people, in families of two children.
+
+    Names, places and dates are drawn in turn from short lists, so they repeat
+    as they do in real datasets, and each person cites one of a hundred sources.
+    """
+    parts = ["0 HEAD\n1 GEDC\n2 VERS 7.0\n"]
+    for i in range(individuals):
+        given = _GIVEN[i % len(_GIVEN)]
+        surname = _SURNAMES[i // 4 % len(_SURNAMES)]
+        parts.append(
+            f"0 @I{i}@ INDI\n"
+            f"1 NAME {given} /{surname}/\n"
+            f"1 SEX {'MF'[i % 2]}\n"
+            f"1 BIRT\n"
+            f"2 DATE {1 + i % 28} JAN {1800 + i % 200}\n"
+            f"2 PLAC {_PLACES[i % len(_PLACES)]}\n"
+            f"2 SOUR @S{i % _SOURCES}@\n"
+            f"3 PAGE p. {i % 50}\n"
+            f"1 {'FAMS' if i % 4 < 2 else 'FAMC'} @F{i // 4}@\n"
+        )
+    for family in range((individuals + 3) // 4):
+        parts.append(f"0 @F{family}@ FAM\n")
+        for role, i in (("HUSB", 0), ("WIFE", 1), ("CHIL", 2), ("CHIL", 3)):
+            if 4 * family + i < individuals:
+                parts.append(f"1 {role} @I{4 * family + i}@\n")
+    for source in range(_SOURCES):
+        parts.append(f"0 @S{source}@ SOUR\n1 TITL Parish register {source % 10}\n")
+    parts.append("0 TRLR\n")
+    return "".join(parts)
+
+
+def with_lines(lines: int, kind: str = "synthetic") -> str:
+    """Make a dataset of about ``lines`` lines, synthetic or maximal70.ged scaled.
+
+    A dataset is made of whole records, so it can come out a little longer or
+    shorter than asked; count its lines to know.
+    """
+    makers: dict[str, Callable[[int], str]] = {
+        "synthetic": synthetic,
+        "maximal": scaled_maximal,
+    }
+    if kind not in makers:
+        raise ValueError(f"unknown kind of dataset {kind!r}")
+    make = makers[kind]
+    # Datasets grow by a set number of lines a unit, past a few lines that are
+    # there whatever their size.
+    small, large = (make(units).count("\n") for units in (100, 200))
+    per_unit = (large - small) / 100
+    return make(max(1, round((lines - (small - 100 * per_unit)) / per_unit)))
+
+
+def best_of(function: Callable[[], object], repeat: int = 5) -> float:
+    """Return the fastest of several runs of a function, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(function: Callable[[], object]) -> int:
+    """Return the peak memory traced while a function runs, in bytes."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
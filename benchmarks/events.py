@@ -0,0 +1,88 @@
+"""Compare extracting fields with events against building trees with load.
+
+Run from the repository root::
+
+    python -m benchmarks.events [copies]
+
+Each way pulls every personal name out of maximal70.ged scaled up; the time is
+the best of three runs, and the memory the peak traced while one ran.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+import gedcom7
+
+from .common import scaled_maximal
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _names_from_load(data: bytes) -> list[str]:
+    records = gedcom7.load(io.BytesIO(data))
+    return [
+        child.text
+        for record in records
+        if record.tag == "INDI"
+        for child in record.children
+        if child.tag == "NAME"
+    ]
+
+
+def _names_from_iterparse(data: bytes) -> list[str]:
+    return [
+        child.text
+        for record in gedcom7.iterparse(io.BytesIO(data))
+        if record.tag == "INDI"
+        for child in record.children
+        if child.tag == "NAME"
+    ]
+
+
+def _names_from_events(data: bytes) -> list[str]:
+    return [
+        text
+        for kind, level, _, tag, _, text in gedcom7.events(io.BytesIO(data))
+        if kind == "start" and level == 1 and tag == "NAME"
+    ]
+
+
+def _measure(function: Callable[[bytes], list[str]], data: bytes) -> tuple[float, int]:
+    """Return the best time of three runs, and the peak memory of one."""
+    seconds = []
+    for _ in range(3):
+        start = time.perf_counter()
+        function(data)
+        seconds.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(seconds), peak
+
+
+def main(copies: int = 100) -> None:
+    """Time each way of extracting names, and trace its memory."""
+    data = scaled_maximal(copies).encode("utf-8")
+    lines = data.count(b"\n")
+    print(f"{lines:,} lines, {len(data) / 2**20:.1f} MiB")
+    for name, function in (
+        ("load", _names_from_load),
+        ("iterparse", _names_from_iterparse),
+        ("events", _names_from_events),
+    ):
+        seconds, peak = _measure(function, data)
+        print(
+            f"{name:>10}: {lines / seconds:10,.0f} lines/s, "
+            f"peak {peak / 2**20:8.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
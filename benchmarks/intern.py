@@ -0,0 +1,67 @@
+"""Measure the memory interning saves in the records of a large dataset.
+
+Run from the repository root::
+
+    python -m benchmarks.intern [individuals]
+
+Tags, cross-reference identifiers and pointers are always interned; the
+baseline undoes that, giving every structure strings of its own as it had before.
+``intern=True`` shares repeated payloads as well. The memory is that traced as
+held by the records once loaded, and the time the best of three loads.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from gedcom7 import parser
+
+from .common import synthetic
+
+
+def _copy(string: str) -> str:
+    """Return an equal string that is not the same object."""
+    return (" " + string)[1:]
+
+
+def _loads(text: str, intern: bool | None) -> list[object]:
+    if intern is not None:
+        return parser.loads(text, intern=intern)
+    original = parser._intern
+    parser._intern = _copy
+    try:
+        return parser.loads(text)
+    finally:
+        parser._intern = original
+
+
+def main(individuals: int = 1_000_000) -> None:
+    """Load a synthetic dataset each way and report what its records hold."""
+    text = synthetic(individuals)
+    lines = text.count("\n")
+    print(f"{individuals:,} individuals, {lines:,} lines")
+    baseline = None
+    for name, intern in (("no interning", None), ("default", False), ("intern", True)):
+        seconds = []
+        for _ in range(3):
+            start = time.perf_counter()
+            _loads(text, intern)
+            seconds.append(time.perf_counter() - start)
+        gc.collect()
+        tracemalloc.start()
+        records = _loads(text, intern)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del records
+        baseline = held if baseline is None else baseline
+        print(
+            f"{name:>12}: {held / 2**20:8.1f} MiB held "
+            f"({1 - held / baseline:6.1%} saved), {min(seconds):6.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
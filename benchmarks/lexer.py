@@ -0,0 +1,34 @@
+"""Compare the parser's fast-path line lexer with the full line grammar.
+
+Run from the repository root::
+
+    python -m benchmarks.lexer [copies]
+"""
+
+from __future__ import annotations
+
+import sys
+
+from gedcom7 import parser
+
+from .common import best_of, scaled_maximal
+
+
+def _regex_only(text: str) -> object:
+    """Lex a line the way the parser did before the fast path existed."""
+    return parser._LINE.fullmatch(text + "\n")
+
+
+def main(copies: int = 200) -> None:
+    """Time both lexers over every line of a scaled-up maximal70.ged."""
+    lines = scaled_maximal(copies).splitlines()
+    print(f"{len(lines):,} lines")
+    for name, lex in (("regex", _regex_only), ("fast path", parser._lex)):
+        seconds = best_of(lambda lex=lex: [lex(line) for line in lines])
+        print(f"{name:>10}: {len(lines) / seconds:12,.0f} lines/s")
+    seconds = best_of(lambda: parser.loads("\n".join(lines)), repeat=3)
+    print(f"{'loads':>10}: {len(lines) / seconds:12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,50 @@
+"""Time each phase of parsing a data stream on its own.
+
+Run from the repository root::
+
+    python -m benchmarks.phases [copies]
+
+The phases are those ``load`` runs a data stream through in turn: decoding the
+bytes, splitting the text into lines -- which checks it for banned characters
+on the way -- lexing each line, and building the records from the lexed lines.
+The last is timed as ``loads`` less splitting and lexing, which it does too.
+Decoding is no part of ``loads``, which is given text, but its time is shown as
+a share of that of ``loads`` all the same, for comparison.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+
+from gedcom7 import parser
+
+from .common import best_of, scaled_maximal
+
+
+def main(copies: int = 200) -> None:
+    """Time each phase over a scaled-up maximal70.ged."""
+    text = scaled_maximal(copies)
+    data = text.encode("utf-8")
+    lines = list(parser._split([text]))
+    print(f"{len(lines):,} lines, {len(data):,} bytes")
+
+    decode = best_of(lambda: list(parser._decode(io.BytesIO(data))))
+    split = best_of(lambda: list(parser._split([text])))
+    lex = best_of(lambda: [parser._lex(line) for line in lines])
+    loads = best_of(lambda: parser.loads(text), repeat=3)
+    for name, seconds in (
+        ("decode", decode),
+        ("split", split),
+        ("lex", lex),
+        ("build", loads - split - lex),
+        ("loads", loads),
+    ):
+        print(
+            f"{name:>6}: {seconds * 1000:8.1f} ms {len(lines) / seconds:12,.0f} "
+            f"lines/s {seconds / loads:7.1%} of loads"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,131 @@
+"""Time the hot paths on datasets of growing size, and report them as JSON.
+
+Run from the repository root::
+
+    python -m benchmarks.suite [--lines 10000,100000,1000000]
+        [--dataset synthetic|maximal] [--repeat 3] [--output results.json]
+
+Each operation -- ``loads``, ``dumps``, ``validate``, ``value`` over every
+structure, and ``generate_schema`` -- is run on a dataset of each size in turn.
+For each the suite reports the best time of ``repeat`` runs, as lines a second
+and microseconds a record, and the peak memory traced during one run more,
+left untimed as tracing slows it down. A table goes to standard error as
+the suite runs; the results go to ``--output``, or to standard output, as JSON,
+to be compared with those of another version.
+
+The synthetic dataset is people, families and sources, whose names, places and
+dates repeat as in real datasets; ``maximal`` repeats maximal70.ged, which
+holds every standard structure type, so ``value`` casts every data type.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import sys
+from typing import TYPE_CHECKING, Any
+
+import gedcom7
+
+from .common import best_of, peak_memory, with_lines
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from gedcom7.types import GedcomStructure
+
+
+def _structures(records: list[GedcomStructure]) -> Iterator[GedcomStructure]:
+    stack = list(reversed(records))
+    while stack:
+        structure = stack.pop()
+        yield structure
+        stack.extend(reversed(structure.children))
+
+
+def _values(records: list[GedcomStructure]) -> None:
+    for structure in _structures(records):
+        structure.value  # noqa: B018
+
+
+def _operations(text: str) -> dict[str, Callable[[], object]]:
+    records = gedcom7.loads(text)
+    return {
+        "loads": lambda: gedcom7.loads(text),
+        "dumps": lambda: gedcom7.dumps(records),
+        "validate": lambda: gedcom7.validate(records),
+        "value": lambda: _values(records),
+        "generate_schema": lambda: gedcom7.generate_schema(records),
+    }
+
+
+def run(sizes: list[int], dataset: str, repeat: int) -> dict[str, Any]:
+    """Run every operation on a dataset of each size, and return the results."""
+    results = []
+    for size in sizes:
+        text = with_lines(size, dataset)
+        lines = text.count("\n")
+        records = sum(1 for line in text.splitlines() if line.startswith("0 "))
+        for operation, function in _operations(text).items():
+            seconds = best_of(function, repeat)
+            peak = peak_memory(function)
+            result = {
+                "operation": operation,
+                "lines": lines,
+                "records": records,
+                "seconds": seconds,
+                "lines_per_second": lines / seconds,
+                "us_per_record": seconds / records * 1e6,
+                "peak_bytes": peak,
+            }
+            results.append(result)
+            print(
+                f"{operation:>15} {lines:>9,} lines {seconds * 1000:10.1f} ms "
+                f"{result['lines_per_second']:12,.0f} lines/s "
+                f"{result['us_per_record']:9.1f} µs/record "
+                f"{peak / 2**20:8.1f} MiB",
+                file=sys.stderr,
+            )
+    return {
+        "gedcom7": gedcom7.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "dataset": dataset,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse the command line, run the suite and write the results."""
+    arguments = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite", description=__doc__.split("\n")[0]
+    )
+    arguments.add_argument(
+        "--lines",
+        default="10000,100000,1000000",
+        help="comma-separated sizes of the datasets, in lines",
+    )
+    arguments.add_argument(
+        "--dataset", choices=("synthetic", "maximal"), default="synthetic"
+    )
+    arguments.add_argument("--repeat", type=int, default=3, help="runs to time")
+    arguments.add_argument("--output", help="file to write the JSON results to")
+    options = arguments.parse_args(argv)
+    # maximal70.ged has extension structures of no standard type, whose every
+    # cast is warned of
+    logging.getLogger("gedcom7.cast").setLevel(logging.ERROR)
+    sizes = [int(size) for size in options.lines.split(",")]
+    report = json.dumps(run(sizes, options.dataset, options.repeat), indent=2)
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as fp:
+            fp.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 from importlib.metadata import PackageNotFoundError, version
 
+from .dataset import Dataset
 from .exceptions import (
     GedcomError,
     GedcomParseError,
@@ -9,21 +10,35 @@ from .exceptions import (
     GedcomValidationError,
 )
 from .formatter import format_value, set_value
-from .parser import load, loads
-from .serializer import dump, dumps, generate_schema
+from .lazy import LazyDataset
+
+# gedcom7.open, kept out of __all__ so that a star import does not shadow the
+# built-in open
+from .lazy import open as open
+from .parallel import load_many
+from .parser import IncrementalParser, events, iterparse, load, load_path, loads
+from .serializer import dump, dump_path, dumps, generate_schema
 from .validator import Error, validate
 
 __all__ = [
+    "Dataset",
     "GedcomError",
     "GedcomParseError",
     "GedcomSerializeError",
     "GedcomValidationError",
     "Error",
+    "IncrementalParser",
+    "LazyDataset",
     "dump",
+    "dump_path",
     "dumps",
+    "events",
     "format_value",
     "generate_schema",
+    "iterparse",
     "load",
+    "load_many",
+    "load_path",
     "loads",
     "set_value",
     "validate",
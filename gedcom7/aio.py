@@ -0,0 +1,79 @@
+"""Parse GEDCOM 7 data streams read by asyncio without blocking the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from .parser import _CHUNK_SIZE, IncrementalParser
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator
+    from concurrent.futures import Executor
+
+    from .types import GedcomStructure
+
+
+async def _pieces(
+    source: asyncio.StreamReader | AsyncIterable[bytes],
+) -> AsyncIterator[bytes]:
+    """Read a source in pieces of at most _CHUNK_SIZE bytes."""
+    if isinstance(source, asyncio.StreamReader):
+        while data := await source.read(_CHUNK_SIZE):
+            yield data
+        return
+    async for data in source:
+        # cut up whatever the source hands over, so no one piece is parsed for
+        # long enough to hold up the event loop
+        for start in range(0, len(data), _CHUNK_SIZE):
+            yield data[start : start + _CHUNK_SIZE]
+
+
+async def aiterparse(
+    source: asyncio.StreamReader | AsyncIterable[bytes],
+    *,
+    executor: Executor | None = None,
+) -> AsyncIterator[GedcomStructure]:
+    """Parse a data stream from an asyncio stream or async byte iterator.
+
+    ::
+
+        async for record in gedcom7.aio.aiterparse(reader):
+            ...
+
+    The stream is parsed a bounded piece at a time, giving the event loop a turn
+    after each, and each record is yielded once complete, as by
+    :func:`gedcom7.iterparse`. Errors are those of :func:`gedcom7.loads`.
+
+    Pass a thread pool as ``executor`` to parse the pieces there instead. A
+    process pool cannot be used: the parser's state lives in this process.
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        raise TypeError("the parser's state cannot cross processes; use threads")
+    loop = asyncio.get_running_loop()
+    parser = IncrementalParser()
+    async for data in _pieces(source):
+        if executor is None:
+            parser.feed(data)
+            await asyncio.sleep(0)
+        else:
+            await loop.run_in_executor(executor, parser.feed, data)
+        for record in parser.read_records():
+            yield record
+    parser.close()
+    for record in parser.read_records():
+        yield record
+
+
+async def aload(
+    source: asyncio.StreamReader | AsyncIterable[bytes],
+    *,
+    executor: Executor | None = None,
+) -> list[GedcomStructure]:
+    """Load a GEDCOM 7 dataset from an asyncio stream or async byte iterator.
+
+    The asynchronous counterpart of :func:`gedcom7.load`; see :func:`aiterparse`
+    for how the event loop is kept free.
+    """
+    return [record async for record in aiterparse(source, executor=executor)]
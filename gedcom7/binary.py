@@ -0,0 +1,195 @@
+"""Save parsed records in a compact binary form, quick to load again.
+
+::
+
+    with open("family.g7b", "wb") as fp:
+        gedcom7.binary.dump(records, fp)
+    with open("family.g7b", "rb") as fp:
+        records = gedcom7.binary.load(fp)
+
+Loading is several times faster than parsing the data stream again: there are
+no lines to split and lex, no CONT lines to fold and no escapes to undo, and the
+strings are decoded all at once. The records loaded are equal to those dumped,
+whatever they hold, conforming or not.
+
+The format: a header giving the version and the counts, then columns of
+numbers, one row per structure in the order the lines would be in, then every
+distinct string once, as one UTF-8 text. The columns are each structure's level
+and its tag, cross-reference identifier, pointer and payload, the last four as
+indexes into the strings, and the length of each string. A column is an array
+of unsigned little-endian integers, each as wide as its largest needs, so most
+take one or two bytes a row. The version is raised whenever the format changes,
+and data of another version is refused rather than misread.
+"""
+
+from __future__ import annotations
+
+import array
+import gc
+import itertools
+import struct
+import sys
+from typing import TYPE_CHECKING
+
+from .exceptions import GedcomError
+from .types import GedcomStructure
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import BinaryIO
+
+_MAGIC = b"GEDCOM7\x00"
+_VERSION = 1
+# magic, version, strings, structures, bytes of UTF-8
+_HEADER = struct.Struct("<8sBQQQ")
+# the array type codes a column can be written with, narrowest first
+_TYPECODES = "BHIQ"
+
+_new = object.__new__
+
+
+def _column(values: list[int]) -> bytes:
+    """Write a column in the narrowest array it fits, after its type code."""
+    top = max(values, default=0)
+    for typecode in _TYPECODES:
+        column = array.array(typecode)
+        if top >> (8 * column.itemsize) == 0:
+            break
+    column.fromlist(values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return typecode.encode("ascii") + column.tobytes()
+
+
+def _columns(records: Iterable[GedcomStructure]) -> tuple[list[str], list[list[int]]]:
+    """Return the structures' distinct strings, and the columns, levels first."""
+    # A string's index; xref and pointer columns hold index + 1, 0 being None.
+    indexes: dict[str, int] = {"": 0}
+    levels: list[int] = []
+    tags: list[int] = []
+    xrefs: list[int] = []
+    pointers: list[int] = []
+    texts: list[int] = []
+    setdefault = indexes.setdefault
+    for record in records:
+        stack = [(record, 0)]
+        while stack:
+            structure, level = stack.pop()
+            levels.append(level)
+            tags.append(setdefault(structure.tag, len(indexes)))
+            xref, pointer = structure.xref, structure.pointer
+            xrefs.append(0 if xref is None else setdefault(xref, len(indexes)) + 1)
+            pointers.append(
+                0 if pointer is None else setdefault(pointer, len(indexes)) + 1
+            )
+            texts.append(setdefault(structure.text, len(indexes)))
+            level += 1
+            stack.extend((child, level) for child in reversed(structure.children))
+    return list(indexes), [levels, tags, xrefs, pointers, texts]
+
+
+def dumps(records: Iterable[GedcomStructure]) -> bytes:
+    """Encode records in the binary form :func:`loads` reads."""
+    strings, columns = _columns(records)
+    text = "".join(strings).encode("utf-8")
+    return b"".join(
+        [
+            _HEADER.pack(_MAGIC, _VERSION, len(strings), len(columns[0]), len(text)),
+            _column([len(string) for string in strings]),
+            *map(_column, columns),
+            text,
+        ]
+    )
+
+
+def dump(records: Iterable[GedcomStructure], fp: BinaryIO) -> None:
+    """Write records to a binary file object in the form :func:`load` reads."""
+    fp.write(dumps(records))
+
+
+def _read_column(data: memoryview, offset: int, length: int) -> tuple[list[int], int]:
+    """Read a column of ``length`` numbers, and return the offset after it."""
+    typecode = chr(data[offset])
+    if typecode not in _TYPECODES:
+        raise GedcomError(f"corrupt binary data: no column at byte {offset}")
+    column = array.array(typecode)
+    offset += 1
+    end = offset + length * column.itemsize
+    if end > len(data):
+        raise GedcomError("corrupt binary data: it ends too soon")
+    column.frombytes(data[offset:end])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tolist(), end
+
+
+def _build(strings: list[str], columns: list[list[int]]) -> list[GedcomStructure]:
+    """Build the records from the strings and the columns."""
+    # indexed by xref and pointer columns, which count from 1
+    optional: list[str | None] = [None, *strings]
+    records: list[GedcomStructure] = []
+    stack: list[GedcomStructure] = []
+    try:
+        for level, tag, xref, pointer, payload in zip(*columns, strict=True):
+            # Every field is set here, skipping the dataclass's __init__ and
+            # __post_init__, which would otherwise take most of the time.
+            structure = _new(GedcomStructure)
+            structure.tag = strings[tag]
+            structure.pointer = optional[pointer]
+            structure.text = strings[payload]
+            structure.xref = optional[xref]
+            structure.children = []
+            structure.dataset = None
+            if level:
+                parent = structure.parent = stack[level - 1]
+                parent.children.append(structure)
+                del stack[level:]
+            else:
+                structure.parent = None
+                records.append(structure)
+                stack.clear()
+            stack.append(structure)
+    except IndexError:
+        raise GedcomError("corrupt binary data: a structure is out of place") from None
+    return records
+
+
+def loads(data: bytes) -> list[GedcomStructure]:
+    """Decode records from the binary form :func:`dumps` writes.
+
+    Raises :class:`~gedcom7.exceptions.GedcomError` if the data is not of this
+    form, of another version, or corrupt.
+    """
+    view = memoryview(data)
+    if len(view) < _HEADER.size or bytes(view[: len(_MAGIC)]) != _MAGIC:
+        raise GedcomError("not binary GEDCOM data")
+    _, version, n_strings, n_structures, n_bytes = _HEADER.unpack_from(view)
+    if version != _VERSION:
+        raise GedcomError(
+            f"binary GEDCOM data of version {version}; version {_VERSION} "
+            "is the only one read"
+        )
+    lengths, offset = _read_column(view, _HEADER.size, n_strings)
+    columns = []
+    for _ in range(5):
+        column, offset = _read_column(view, offset, n_structures)
+        columns.append(column)
+    if offset + n_bytes != len(view):
+        raise GedcomError("corrupt binary data: the strings are not all there")
+    text = str(view[offset:], "utf-8")
+    bounds = itertools.pairwise(itertools.accumulate(lengths, initial=0))
+    strings = [text[start:end] for start, end in bounds]
+    # Nothing built is garbage until it is all built, so the collector, which
+    # would otherwise go over the growing trees again and again, is paused.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _build(strings, columns)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def load(fp: BinaryIO) -> list[GedcomStructure]:
+    """Read records from a binary file object written by :func:`dump`."""
+    return loads(fp.read())
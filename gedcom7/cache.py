@@ -0,0 +1,161 @@
+"""Keep the records parsed from files on disk, to load them again unparsed.
+
+Used by :func:`gedcom7.load_path` given a ``cache_dir``. Each entry holds the
+records loaded from one file, with some options, in the binary form of
+:mod:`gedcom7.binary`, after the size, modification time and a hash of the
+contents of the file they were parsed from. An entry is used while the file's
+size and modification time are unchanged, and when only its modification time
+has changed, if its contents still hash the same.
+
+An entry is written to a temporary file first and moved into place, so several
+processes can share a cache: a process reads either no entry or a whole one.
+Entries used least recently are removed once the cache grows beyond its size.
+The cache is a convenience only: an entry that cannot be written, or read, is
+done without.
+"""
+
+from __future__ import annotations
+
+import builtins
+import contextlib
+import hashlib
+import os
+import struct
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+from . import binary
+from .exceptions import GedcomError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .types import GedcomStructure
+
+# the size the entries of a cache are kept to, unless told otherwise
+DEFAULT_SIZE = 1 << 30
+
+_SUFFIX = ".g7c"
+_TEMPORARY_SUFFIX = ".tmp"
+# A temporary file this many seconds old was left by a process that died
+# writing it, and is removed.
+_STALE = 3600
+# the file's size, modification time in nanoseconds and hash
+_HEADER = struct.Struct("<QQ16s")
+_CHUNK_SIZE = 1 << 20
+
+
+def _digest(path: str | os.PathLike[str]) -> bytes:
+    """Hash the contents of a file."""
+    digest = hashlib.blake2b(digest_size=16)
+    with builtins.open(path, "rb") as fp:
+        while chunk := fp.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _entry(cache_dir: str | os.PathLike[str], path: str, options: object) -> str:
+    """Return the path of the entry for a file loaded with some options."""
+    key = repr((os.path.realpath(path), options)).encode("utf-8")
+    name = hashlib.blake2b(key, digest_size=16).hexdigest()
+    return os.path.join(cache_dir, name + _SUFFIX)
+
+
+def _read(
+    entry: str, path: str | os.PathLike[str], stat: os.stat_result
+) -> list[GedcomStructure] | None:
+    """Read the records from a file's entry, or None if it is missing or stale."""
+    try:
+        with builtins.open(entry, "rb") as fp:
+            header = fp.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return None
+            size, mtime_ns, digest = _HEADER.unpack(header)
+            if size != stat.st_size:
+                return None
+            if mtime_ns != stat.st_mtime_ns and digest != _digest(path):
+                return None
+            records = binary.loads(fp.read())
+    except (OSError, GedcomError):
+        return None
+    # the entry's modification time tells when it was last used
+    with contextlib.suppress(OSError):
+        os.utime(entry)
+    return records
+
+
+def _write(
+    entry: str, stat: os.stat_result, digest: bytes, records: list[GedcomStructure]
+) -> None:
+    """Write the records to an entry, if the cache's directory allows it."""
+    directory = os.path.dirname(entry)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix=_TEMPORARY_SUFFIX)
+    except OSError:
+        return
+    try:
+        with builtins.open(fd, "wb") as fp:
+            fp.write(_HEADER.pack(stat.st_size, stat.st_mtime_ns, digest))
+            binary.dump(records, fp)
+        os.replace(temporary, entry)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+
+
+def _evict(directory: str, size: int) -> None:
+    """Remove the entries used least recently until the rest fit in ``size``."""
+    entries = []
+    now = time.time()
+    try:
+        with os.scandir(directory) as scan:
+            for item in scan:
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                if item.name.endswith(_SUFFIX):
+                    entries.append((stat.st_mtime, stat.st_size, item.path))
+                elif (
+                    item.name.endswith(_TEMPORARY_SUFFIX)
+                    and now - stat.st_mtime > _STALE
+                ):
+                    with contextlib.suppress(OSError):
+                        os.remove(item.path)
+    except OSError:
+        return
+    total = sum(entry_size for _, entry_size, _ in entries)
+    for _, entry_size, path in sorted(entries):
+        if total <= size:
+            break
+        # another process may have removed it already
+        with contextlib.suppress(OSError):
+            os.remove(path)
+        total -= entry_size
+
+
+def load(
+    path: str | os.PathLike[str],
+    cache_dir: str | os.PathLike[str],
+    size: int,
+    options: object,
+    parse: Callable[[], list[GedcomStructure]],
+) -> list[GedcomStructure]:
+    """Load records from the cache, or parse them and add them to it.
+
+    ``options`` are those the file is parsed with, given as something whose
+    ``repr`` tells them apart; ``parse`` parses the file.
+    """
+    stat = os.stat(path)
+    entry = _entry(cache_dir, os.fspath(path), options)
+    records = _read(entry, path, stat)
+    if records is not None:
+        return records
+    # hashed before parsing: if the file changes meanwhile, the entry is stale
+    digest = _digest(path)
+    records = parse()
+    _write(entry, stat, digest, records)
+    _evict(os.path.dirname(entry), size)
+    return records
@@ -0,0 +1,90 @@
+"""Read and write GEDCOM files compressed with gzip, bzip2 or xz.
+
+A compressed file is recognized by its magic bytes, whatever it is called, save
+legacy .lzma files, which have none and are recognized by their extension. A
+file is written compressed as its extension says. Either way the data is
+compressed and decompressed as a stream, a buffer at a time, so the
+uncompressed file is never held in memory or written to disk.
+
+Each codec's module is imported only when a file is read or written with it, as
+Python may be built without some of them.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import BinaryIO, Literal
+
+    _Mode = Literal["rb", "wb"]
+
+
+def _gzip(fp: BinaryIO, mode: _Mode) -> BinaryIO:
+    import gzip
+
+    return cast("BinaryIO", gzip.GzipFile(fileobj=fp, mode=mode))
+
+
+def _bz2(fp: BinaryIO, mode: _Mode) -> BinaryIO:
+    import bz2
+
+    return cast("BinaryIO", bz2.BZ2File(fp, mode))
+
+
+def _xz(fp: BinaryIO, mode: _Mode) -> BinaryIO:
+    import lzma
+
+    # Reading, this takes the legacy .lzma format as well.
+    return cast("BinaryIO", lzma.LZMAFile(fp, mode))
+
+
+def _lzma(fp: BinaryIO, mode: _Mode) -> BinaryIO:
+    if mode == "rb":
+        return _xz(fp, mode)
+    import lzma
+
+    return cast("BinaryIO", lzma.LZMAFile(fp, mode, format=lzma.FORMAT_ALONE))
+
+
+_MAGIC: tuple[tuple[bytes, Callable[[BinaryIO, _Mode], BinaryIO]], ...] = (
+    (b"\x1f\x8b", _gzip),
+    (b"BZh", _bz2),
+    (b"\xfd7zXZ\x00", _xz),
+)
+_SUFFIXES: dict[str, Callable[[BinaryIO, _Mode], BinaryIO]] = {
+    ".gz": _gzip,
+    ".bz2": _bz2,
+    ".xz": _xz,
+    ".lzma": _lzma,
+}
+
+
+def _suffix(path: str | os.PathLike[str]) -> str:
+    return os.path.splitext(os.fspath(path))[1].lower()
+
+
+def reader(fp: BinaryIO, path: str | os.PathLike[str]) -> BinaryIO | None:
+    """Wrap a file opened for reading to decompress it, or return None if plain.
+
+    The file must be seekable: its first bytes are read to tell how it was
+    compressed, and it is then rewound.
+    """
+    magic = fp.read(6)
+    fp.seek(0)
+    for prefix, opener in _MAGIC:
+        if magic.startswith(prefix):
+            return opener(fp, "rb")
+    # Legacy .lzma files have no magic bytes to tell them by.
+    return _xz(fp, "rb") if _suffix(path) == ".lzma" else None
+
+
+def writer(fp: BinaryIO, path: str | os.PathLike[str]) -> BinaryIO | None:
+    """Wrap a file opened for writing to compress it as its extension says.
+
+    Returns None if the extension names no compression.
+    """
+    opener = _SUFFIXES.get(_suffix(path))
+    return None if opener is None else opener(fp, "wb")
@@ -0,0 +1,278 @@
+"""A list of records indexed by cross-reference identifier and by tag."""
+
+from __future__ import annotations
+
+import operator
+from collections.abc import MutableSequence
+from typing import TYPE_CHECKING, overload
+
+from . import const
+from .types import GedcomStructure
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+def _pointing(structure: GedcomStructure) -> Iterator[GedcomStructure]:
+    """Yield the structure and those below it that have a pointer to a record."""
+    stack = [structure]
+    while stack:
+        structure = stack.pop()
+        pointer = structure.pointer
+        if pointer and pointer != const.VOIDPTR:
+            yield structure
+        stack.extend(reversed(structure.children))
+
+
+def backlinks(
+    records: Iterable[GedcomStructure],
+) -> dict[str, list[GedcomStructure]]:
+    """Map each pointer in the records to the structures that have it, in order.
+
+    ::
+
+        citations = gedcom7.dataset.backlinks(records).get("@S7@", [])
+
+    The structures are found in one pass over the records. A
+    :class:`Dataset` keeps such a map up to date, see :meth:`Dataset.backlinks`.
+    """
+    index: dict[str, list[GedcomStructure]] = {}
+    for record in records:
+        for structure in _pointing(record):
+            pointer = structure.pointer
+            if pointer:
+                index.setdefault(pointer, []).append(structure)
+    return index
+
+
+class Dataset(MutableSequence[GedcomStructure]):
+    """The records of a dataset, in order, with their cross-references indexed.
+
+    Returned by :func:`~gedcom7.loads` and :func:`~gedcom7.load` given
+    ``dataset=True``::
+
+        dataset = gedcom7.loads(string, dataset=True)
+        person = dataset["@I1@"]
+        for family in dataset.by_tag("FAM"):
+            husband = family.children[0].target
+
+    A dataset is a list of records like the one ``loads`` returns otherwise, and
+    is changed like a list. The indexes are kept up to date as records are added
+    and removed, rather than rebuilt. They go by each record's cross-reference
+    identifier and tag as it is added: change those of a record in a dataset and
+    the indexes go wrong. A structure's ``target``, the record its pointer
+    points to, is looked up in the dataset its record belongs to, and a record
+    belongs to one dataset at a time: adding one that belongs to another raises
+    ValueError.
+    """
+
+    def __init__(self, records: Iterable[GedcomStructure] = ()) -> None:
+        """Index the records given."""
+        self._records: list[GedcomStructure] = []
+        self._xrefs: dict[str, GedcomStructure] = {}
+        self._tags: dict[str, list[GedcomStructure]] = {}
+        # pointer -> the structures that have it; built when first asked for
+        self._backlinks: dict[str, list[GedcomStructure]] | None = None
+        self.extend(records)
+
+    def _add(self, record: GedcomStructure, index: int) -> None:
+        """Index a record about to be put at ``index``."""
+        if record.dataset is not None and record.dataset is not self:
+            raise ValueError(
+                "the record belongs to another dataset; take it out of that one first"
+            )
+        xref = record.xref
+        if xref:
+            if xref in self._xrefs:
+                raise ValueError(f"duplicate cross-reference identifier {xref}")
+            self._xrefs[xref] = record
+        tagged = self._tags.setdefault(record.tag, [])
+        if index >= len(self._records):
+            tagged.append(record)
+        else:
+            # the records of the same tag before it, to keep the index in order
+            before = sum(r.tag == record.tag for r in self._records[:index])
+            tagged.insert(before, record)
+        record.dataset = self
+        self._link(record)
+
+    def _remove(self, record: GedcomStructure) -> None:
+        """Drop a record about to be taken out from the indexes."""
+        self._unlink(record)
+        if record.xref:
+            del self._xrefs[record.xref]
+        tagged = self._tags[record.tag]
+        del tagged[next(i for i, r in enumerate(tagged) if r is record)]
+        if not tagged:
+            del self._tags[record.tag]
+        record.dataset = None
+
+    def _link(self, structure: GedcomStructure, subtree: bool = True) -> None:
+        """Add a structure, and those below it, to the backlinks, if built."""
+        index = self._backlinks
+        if index is None:
+            return
+        for pointing in _pointing(structure) if subtree else [structure]:
+            pointer = pointing.pointer
+            if pointer and pointer != const.VOIDPTR:
+                index.setdefault(pointer, []).append(pointing)
+
+    def _unlink(self, structure: GedcomStructure, subtree: bool = True) -> None:
+        """Drop a structure, and those below it, from the backlinks, if built.
+
+        A structure whose pointer was assigned directly is not where its pointer
+        says, and is left as it is.
+        """
+        index = self._backlinks
+        if index is None:
+            return
+        for pointing in _pointing(structure) if subtree else [structure]:
+            pointer = pointing.pointer
+            if not pointer or pointer not in index:
+                continue
+            structures = index[pointer]
+            for i, indexed in enumerate(structures):
+                if indexed is pointing:
+                    del structures[i]
+                    break
+            if not structures:
+                del index[pointer]
+
+    @overload
+    def __getitem__(self, key: int | str) -> GedcomStructure: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> list[GedcomStructure]: ...
+
+    def __getitem__(
+        self, key: int | str | slice
+    ) -> GedcomStructure | list[GedcomStructure]:
+        """Return the record at an index, or with a cross-reference identifier.
+
+        Raises KeyError if no record has the identifier.
+        """
+        if isinstance(key, str):
+            return self._xrefs[key]
+        return self._records[key]
+
+    @overload
+    def __setitem__(self, index: int, value: GedcomStructure) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[GedcomStructure]) -> None: ...
+
+    def __setitem__(
+        self,
+        index: int | slice,
+        value: GedcomStructure | Iterable[GedcomStructure],
+    ) -> None:
+        """Replace a record, or a slice of them."""
+        if isinstance(index, slice):
+            if isinstance(value, GedcomStructure):
+                raise TypeError("can only assign an iterable of records to a slice")
+            values = list(value)
+            indices = range(*index.indices(len(self._records)))
+            if index.step not in (None, 1):
+                if len(values) != len(indices):
+                    raise ValueError(
+                        f"attempt to assign sequence of size {len(values)} to "
+                        f"extended slice of size {len(indices)}"
+                    )
+                for i, record in zip(indices, values, strict=True):
+                    self[i] = record
+                return
+            del self[index]
+            for offset, record in enumerate(values):
+                self.insert(indices.start + offset, record)
+            return
+        if not isinstance(value, GedcomStructure):
+            raise TypeError(f"a record must be a GedcomStructure, not {value!r}")
+        index = range(len(self._records))[index]
+        old = self._records[index]
+        self._remove(old)
+        try:
+            self._add(value, index)
+        except BaseException:
+            self._add(old, index)
+            raise
+        self._records[index] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        """Remove a record, or a slice of them."""
+        removed = self._records[index]
+        for record in removed if isinstance(removed, list) else [removed]:
+            self._remove(record)
+        del self._records[index]
+
+    def __len__(self) -> int:
+        """Return the number of records."""
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[GedcomStructure]:
+        """Iterate over the records in order."""
+        return iter(self._records)
+
+    def __contains__(self, value: object) -> bool:
+        """Tell whether a record has a cross-reference identifier, or is here.
+
+        A string is looked up as a cross-reference identifier; anything else is
+        compared with the records, as by a list.
+        """
+        if isinstance(value, str):
+            return value in self._xrefs
+        return value in self._records
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the records with those of another dataset, or a list."""
+        if isinstance(other, Dataset):
+            return self._records == other._records
+        if isinstance(other, list):
+            return self._records == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Return the records' representation, as a list would."""
+        return f"Dataset({self._records!r})"
+
+    def insert(self, index: int, value: GedcomStructure) -> None:
+        """Insert a record before an index."""
+        index = operator.index(index)
+        length = len(self._records)
+        if index < 0:
+            index = max(index + length, 0)
+        self._add(value, min(index, length))
+        self._records.insert(index, value)
+
+    def get(
+        self, xref: str, default: GedcomStructure | None = None
+    ) -> GedcomStructure | None:
+        """Return the record with a cross-reference identifier, or ``default``."""
+        return self._xrefs.get(xref, default)
+
+    def by_tag(self, tag: str) -> list[GedcomStructure]:
+        """Return the records with a tag, in order."""
+        return list(self._tags.get(tag, ()))
+
+    def backlinks(self, xref: str) -> list[GedcomStructure]:
+        """Return the structures whose pointer points to a record.
+
+        ::
+
+            families = [link.record for link in dataset.backlinks("@I42@")]
+
+        The index is built in one pass the first time it is asked for, and then
+        kept up to date as records are added and removed, as substructures are
+        added by :meth:`~gedcom7.types.GedcomStructure.append_child` and removed
+        by :meth:`~gedcom7.types.GedcomStructure.remove_child`, and as
+        pointers are set by :meth:`~gedcom7.types.GedcomStructure.set_pointer`.
+        The structures are in the order they were indexed in.
+        """
+        if self._backlinks is None:
+            self._backlinks = backlinks(self._records)
+        return list(self._backlinks.get(xref, ()))
+
+    @property
+    def head(self) -> GedcomStructure | None:
+        """The HEAD pseudo-structure, or None if there is none."""
+        heads = self._tags.get(const.HEAD)
+        return heads[0] if heads else None
@@ -0,0 +1,376 @@
+"""Export records to tables for analysis, one table per record type.
+
+::
+
+    frames = gedcom7.export.to_frames(gedcom7.load_path("family.ged"))
+    births = frames["events"].query("tag == 'BIRT'")
+    per_century = births.groupby(births.date // 1_000_000).size()
+
+Each table is built a column at a time: the payloads of a column are gathered
+as strings in one pass over the records, then cast together by the data type
+``const.payloads`` gives the column's structure type, each distinct payload
+once, rather than structure by structure through ``GedcomStructure.value``.
+Dates become integer sort keys, see :func:`date_key`, and ``LATI`` and
+``LONG`` floats in signed decimal degrees.
+
+The tables are pandas data frames, Arrow tables or plain dicts of lists, as
+``backend`` says; pandas and pyarrow are optional, installed with the
+``pandas`` and ``arrow`` extras.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, Literal
+
+from . import cast, const, types
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .types import GedcomStructure
+
+_Kind = Literal["str", "int", "float"]
+_Columns = dict[str, tuple[_Kind, list[Any]]]
+
+_V7 = "https://gedcom.io/terms/v7/"
+
+# the substructures of individual and family records that are events or
+# attributes: those that can have a place
+_EVENTS = {
+    tag: {
+        child
+        for child, type_id in const.substructures[f"{_V7}record-{tag}"].items()
+        if const.PLAC in const.substructures.get(type_id, {})
+    }
+    for tag in (const.INDI, const.FAM)
+}
+
+# the calendars whose months const.GEDCOM_MONTHS numbers
+_MONTHS_CALENDARS = (None, "GREGORIAN", "JULIAN")
+
+
+def date_key(value: types.DateValue) -> int | None:
+    """Return an integer sorting as a date does, ``year * 10000 + month * 100 + day``.
+
+    A missing month or day counts as 0, so ``1850`` sorts before ``JAN 1850``,
+    and a year before the common era is negative. An approximate date, a range
+    or a period sorts by the first date it gives. Months are numbered in the
+    Gregorian and Julian calendars only: dates in any other sort by year alone.
+    Returns None if there is no date.
+    """
+    date: types.Date | None
+    if isinstance(value, types.DateApprox):
+        date = value.date
+    elif isinstance(value, types.DateRange):
+        date = value.start or value.end
+    elif isinstance(value, types.DatePeriod):
+        date = value.from_ or value.to
+    else:
+        date = value
+    if date is None or date.year is None:
+        return None
+    month = day = 0
+    if date.calendar in _MONTHS_CALENDARS:
+        month = const.GEDCOM_MONTHS.get((date.month or "").upper(), 0)
+        day = date.day or 0
+    year = -date.year if date.epoch else date.year
+    return year * 10000 + month * 100 + day
+
+
+def _date(text: str) -> int | None:
+    return date_key(cast._cast_date_value(text))
+
+
+# payload data type -> the function casting a payload of it, and the kind of
+# column it makes; payloads of any other data type are kept as strings
+_CASTS: dict[str, tuple[Callable[[str], Any], _Kind]] = {
+    "https://gedcom.io/terms/v7/type-Date": (_date, "int"),
+    "https://gedcom.io/terms/v7/type-Latitude": (cast._cast_latitude, "float"),
+    "https://gedcom.io/terms/v7/type-Longitude": (cast._cast_longitude, "float"),
+    "http://www.w3.org/2001/XMLSchema#nonNegativeInteger": (int, "int"),
+}
+
+
+def _payload(name: str) -> str:
+    """Return the data type of the payload of a standard structure type."""
+    return const.payloads[_V7 + name]
+
+
+def _cast_column(
+    texts: list[str | None], payload: str | None
+) -> tuple[_Kind, list[Any]]:
+    """Cast a column of payloads of one data type, and tell its kind.
+
+    Each distinct payload is cast once. A payload that cannot be cast, like a
+    missing one, becomes None.
+    """
+    cast_kind = None if payload is None else _CASTS.get(payload)
+    if cast_kind is None:
+        return "str", [text or None for text in texts]
+    function, kind = cast_kind
+    cache: dict[str | None, Any] = {None: None, "": None}
+    for text in {text for text in texts if text}:
+        try:
+            cache[text] = function(text)
+        except ValueError:
+            cache[text] = None
+    return kind, [cache[text] for text in texts]
+
+
+class _Table:
+    """A table's columns as they are gathered, payloads not yet cast."""
+
+    def __init__(self, payloads: dict[str, str | None]) -> None:
+        """Name each column, with the data type of its payloads if not text."""
+        self.payloads = payloads
+        self.texts: dict[str, list[str | None]] = {name: [] for name in payloads}
+
+    def add(self, *row: str | None) -> None:
+        """Add a row, a payload or None for each column."""
+        for column, text in zip(self.texts.values(), row, strict=True):
+            column.append(text)
+
+    def cast(self) -> _Columns:
+        """Cast each column by the data type of its payloads."""
+        return {
+            name: _cast_column(texts, self.payloads[name])
+            for name, texts in self.texts.items()
+        }
+
+
+def _child(structure: GedcomStructure, tag: str) -> GedcomStructure | None:
+    for child in structure.children:
+        if child.tag == tag:
+            return child
+    return None
+
+
+def _text(structure: GedcomStructure, *path: str) -> str | None:
+    """Return the payload at a path of tags below a structure, if there is one."""
+    for tag in path:
+        found = _child(structure, tag)
+        if found is None:
+            return None
+        structure = found
+    return structure.text
+
+
+def _pointer(structure: GedcomStructure, tag: str) -> str | None:
+    child = _child(structure, tag)
+    if child is None or child.pointer == const.VOIDPTR:
+        return None
+    return child.pointer
+
+
+def _gather(records: Iterable[GedcomStructure]) -> dict[str, _Table]:
+    """Gather the tables in one pass over the records."""
+    date = _payload("DATE")
+    count = _payload("INDI-NCHI")
+    latitude, longitude = _payload("LATI"), _payload("LONG")
+    individuals = _Table(
+        {
+            "xref": None,
+            "name": _payload("INDI-NAME"),
+            "sex": _payload("SEX"),
+            "birth_date": date,
+            "death_date": date,
+        }
+    )
+    families = _Table(
+        {
+            "xref": None,
+            "husband": None,
+            "wife": None,
+            "children": count,
+            "marriage_date": date,
+        }
+    )
+    events = _Table(
+        {
+            "record": None,
+            "record_tag": None,
+            "tag": None,
+            "type": _payload("TYPE"),
+            "date": date,
+            "date_text": None,
+            "place": _payload("PLAC"),
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+    )
+    sources = _Table(
+        {
+            "xref": None,
+            "title": _payload("TITL"),
+            "author": _payload("AUTH"),
+            "publication": _payload("PUBL"),
+            "abbreviation": _payload("ABBR"),
+        }
+    )
+    # place name -> [events, latitude, longitude], the first coordinates given
+    places: dict[str, list[Any]] = {}
+    for record in records:
+        tag = record.tag
+        if tag == const.INDI:
+            individuals.add(
+                record.xref,
+                _text(record, const.NAME),
+                _text(record, const.SEX),
+                _text(record, const.BIRT, const.DATE),
+                _text(record, const.DEAT, const.DATE),
+            )
+        elif tag == const.FAM:
+            families.add(
+                record.xref,
+                _pointer(record, const.HUSB),
+                _pointer(record, const.WIFE),
+                str(sum(child.tag == const.CHIL for child in record.children)),
+                _text(record, const.MARR, const.DATE),
+            )
+        elif tag == const.SOUR:
+            sources.add(
+                record.xref,
+                _text(record, const.TITL),
+                _text(record, const.AUTH),
+                _text(record, const.PUBL),
+                _text(record, const.ABBR),
+            )
+            continue
+        else:
+            continue
+        kinds = _EVENTS[tag]
+        for event in record.children:
+            if event.tag not in kinds:
+                continue
+            date_text = _text(event, const.DATE)
+            place = _child(event, const.PLAC)
+            lati = long = None
+            if place is not None:
+                lati = _text(place, const.MAP, const.LATI)
+                long = _text(place, const.MAP, const.LONG)
+                known = places.setdefault(place.text, [0, lati, long])
+                known[0] += 1
+                if known[1] is None:
+                    known[1:] = [lati, long]
+            events.add(
+                record.xref,
+                tag,
+                event.tag,
+                _text(event, const.TYPE),
+                date_text,
+                date_text,
+                None if place is None else place.text,
+                lati,
+                long,
+            )
+    place_table = _Table(
+        {
+            "name": _payload("PLAC"),
+            "events": count,
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+    )
+    for name, (number, lati, long) in places.items():
+        place_table.add(name, str(number), lati, long)
+    return {
+        "individuals": individuals,
+        "families": families,
+        "events": events,
+        "places": place_table,
+        "sources": sources,
+    }
+
+
+def _require(module: str, extra: str) -> Any:
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        raise ImportError(
+            f"exporting to {module} needs it installed: "
+            f"python -m pip install 'gedcom7[{extra}]'"
+        ) from exc
+
+
+def _pandas() -> Callable[[_Columns], Any]:
+    pandas = _require("pandas", "pandas")
+    dtypes = {"str": "object", "int": "Int64", "float": "float64"}
+
+    def build(columns: _Columns) -> Any:
+        return pandas.DataFrame(
+            {
+                name: pandas.Series(values, dtype=dtypes[kind])
+                for name, (kind, values) in columns.items()
+            }
+        )
+
+    return build
+
+
+def _arrow() -> Callable[[_Columns], Any]:
+    pyarrow = _require("pyarrow", "arrow")
+    arrow_types = {
+        "str": pyarrow.string(),
+        "int": pyarrow.int64(),
+        "float": pyarrow.float64(),
+    }
+
+    def build(columns: _Columns) -> Any:
+        return pyarrow.table(
+            {
+                name: pyarrow.array(values, type=arrow_types[kind])
+                for name, (kind, values) in columns.items()
+            }
+        )
+
+    return build
+
+
+def _lists() -> Callable[[_Columns], Any]:
+    def build(columns: _Columns) -> Any:
+        return {name: values for name, (_, values) in columns.items()}
+
+    return build
+
+
+_BACKENDS: dict[str, Callable[[], Callable[[_Columns], Any]]] = {
+    "pandas": _pandas,
+    "arrow": _arrow,
+    "lists": _lists,
+}
+
+
+def to_frames(
+    records: Iterable[GedcomStructure],
+    *,
+    backend: Literal["pandas", "arrow", "lists"] = "pandas",
+) -> dict[str, Any]:
+    """Export records to one table per record type.
+
+    Returns a dict of tables:
+
+    - ``individuals``: ``xref``, ``name``, ``sex``, ``birth_date``,
+      ``death_date``.
+    - ``families``: ``xref``, ``husband``, ``wife``, ``children`` (how many),
+      ``marriage_date``.
+    - ``events``: one row per event or attribute of an individual or family:
+      ``record`` and ``record_tag``, its record's, ``tag``, ``type``, ``date``
+      and ``date_text``, the payload it was cast from, ``place``, ``latitude``
+      and ``longitude``.
+    - ``places``: one row per distinct place name in the events: ``name``,
+      the number of ``events`` there, and its ``latitude`` and ``longitude``
+      as first given.
+    - ``sources``: ``xref``, ``title``, ``author``, ``publication``,
+      ``abbreviation``.
+
+    ``backend`` is ``"pandas"`` for data frames, ``"arrow"`` for
+    ``pyarrow.Table``, or ``"lists"`` for dicts of lists needing neither;
+    raises ImportError if the library asked for is not installed. A payload
+    that cannot be cast, like a missing one, is null.
+    """
+    factory = _BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(f"unknown backend {backend!r}")
+    build = factory()
+    return {name: build(table.cast()) for name, table in _gather(records).items()}
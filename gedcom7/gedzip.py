@@ -0,0 +1,204 @@
+"""Read GEDZIP packages without extracting them.
+
+A GEDZIP package is a zip archive holding a dataset as ``gedcom.ged`` together
+with the files its ``FILE`` structures refer to by a relative URL, a path within
+the archive::
+
+    with gedcom7.gedzip.open("family.gdz") as package:
+        records = package.load()
+        for file, media in package.media(records):
+            if file.text.endswith(".jpg"):
+                thumbnail = media.read()
+
+The dataset is decompressed and parsed as it is read from its member, and a
+media file is not so much as opened until it is read.
+"""
+
+from __future__ import annotations
+
+import io
+import urllib.parse
+import zipfile
+from typing import IO, TYPE_CHECKING, cast
+
+from . import const, parser
+from .exceptions import GedcomError
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Collection, Iterable, Iterator
+    from types import TracebackType
+    from typing import BinaryIO
+
+    from _typeshed import WriteableBuffer
+
+    from .types import GedcomStructure
+
+# the member holding the dataset
+DATASET = "gedcom.ged"
+
+
+class MediaFile(io.RawIOBase):
+    """A file in a GEDZIP package, opened the first time it is read or sought.
+
+    Until then nothing of it has been read but the archive's directory entry,
+    which gives its ``name`` and uncompressed ``size``.
+    """
+
+    def __init__(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo) -> None:
+        """Refer to a member of an open archive."""
+        super().__init__()
+        self._archive = archive
+        self._info = info
+        self._member: IO[bytes] | None = None
+        self.name = info.filename
+        self.size = info.file_size
+
+    def _open(self) -> IO[bytes]:
+        if self._member is None:
+            if self.closed:
+                raise ValueError("I/O operation on closed file.")
+            self._member = self._archive.open(self._info)
+        return self._member
+
+    def readable(self) -> bool:
+        """Return True: a member can always be read."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True if the archive can be sought in, and so its members."""
+        return self._open().seekable()
+
+    def readinto(self, buffer: WriteableBuffer) -> int:
+        """Read into a buffer, opening the member if it is not yet."""
+        view = memoryview(buffer).cast("B")
+        data = self._open().read(len(view))
+        view[: len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a position in the member, opening it if it is not yet."""
+        return self._open().seek(offset, whence)
+
+    def tell(self) -> int:
+        """Return the position in the member: 0 until it has been opened."""
+        return 0 if self._member is None else self._member.tell()
+
+    def close(self) -> None:
+        """Close the member, if it was opened."""
+        if self._member is not None:
+            self._member.close()
+        super().close()
+
+
+class GedzipPackage:
+    """A GEDZIP package open for reading; returned by :func:`open`."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open the archive and check that it holds a dataset."""
+        self._archive = zipfile.ZipFile(path)
+        try:
+            self._archive.getinfo(DATASET)
+        except KeyError:
+            self._archive.close()
+            raise GedcomError(
+                f"{path} is not a GEDZIP package: it holds no {DATASET}"
+            ) from None
+
+    def iterparse(
+        self,
+        *,
+        include_records: Collection[str] | None = None,
+        exclude_records: Collection[str] | None = None,
+        intern: bool = False,
+    ) -> Iterator[GedcomStructure]:
+        """Parse the dataset record by record, as :func:`gedcom7.iterparse` does.
+
+        The member is decompressed a chunk at a time as the parser reads it.
+        """
+        with self._archive.open(DATASET) as fp:
+            yield from parser.iterparse(
+                cast("BinaryIO", fp),
+                include_records=include_records,
+                exclude_records=exclude_records,
+                intern=intern,
+            )
+
+    def load(
+        self,
+        *,
+        include_records: Collection[str] | None = None,
+        exclude_records: Collection[str] | None = None,
+        intern: bool = False,
+    ) -> list[GedcomStructure]:
+        """Load the dataset, as :func:`gedcom7.load` does."""
+        return list(
+            self.iterparse(
+                include_records=include_records,
+                exclude_records=exclude_records,
+                intern=intern,
+            )
+        )
+
+    def file(self, reference: str) -> MediaFile:
+        """Return the file a ``FILE`` payload refers to, unopened.
+
+        Raises KeyError if the payload is not a path within the package: it may
+        be a URL of a file kept elsewhere, or the file may be missing.
+        """
+        url = urllib.parse.urlsplit(reference)
+        if url.scheme or url.netloc:
+            raise KeyError(f"{reference} is not a file within the package")
+        name = urllib.parse.unquote(url.path)
+        try:
+            info = self._archive.getinfo(name)
+        except KeyError:
+            raise KeyError(f"{reference} is not a file within the package") from None
+        return MediaFile(self._archive, info)
+
+    def media(
+        self, records: Iterable[GedcomStructure]
+    ) -> Iterator[tuple[GedcomStructure, MediaFile]]:
+        """Yield each ``OBJE.FILE`` structure of the records and its file.
+
+        The records may be those :meth:`iterparse` is yielding, to go through
+        the media as the dataset is read. Files not within the package are left
+        out.
+        """
+        for record in records:
+            if record.tag != const.OBJE:
+                continue
+            for child in record.children:
+                if child.tag != const.FILE:
+                    continue
+                try:
+                    media = self.file(child.text)
+                except KeyError:
+                    continue
+                yield child, media
+
+    def close(self) -> None:
+        """Close the archive; media files opened from it can then not be read."""
+        self._archive.close()
+
+    def __enter__(self) -> GedzipPackage:
+        """Return the package itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the archive."""
+        self.close()
+
+
+def open(path: str | os.PathLike[str]) -> GedzipPackage:
+    """Open a GEDZIP package to read its dataset and media from.
+
+    See :class:`GedzipPackage`. Close it when done, or use it in a ``with``
+    statement.
+    """
+    return GedzipPackage(path)
@@ -0,0 +1,317 @@
+"""Open a dataset without parsing it, and parse its records as they are asked for.
+
+Only the level 0 lines are read up front: each gives a record's
+cross-reference identifier and tag, and the bytes up to the next give its
+extent. HEAD is parsed at once, since the schema it declares is needed to
+parse the rest, and TRLR to check the dataset is whole. Any other record is
+parsed when it is first asked for and kept in a cache of those most recently
+used.
+
+Errors in a record are raised when it is parsed, not when the dataset is
+opened, and pointers are not checked at all: that would mean parsing every
+record, which is what this avoids.
+"""
+
+from __future__ import annotations
+
+import builtins
+import collections
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+from typing import TYPE_CHECKING, NamedTuple
+
+from . import parser
+from .exceptions import GedcomError, GedcomParseError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    from .types import GedcomStructure
+
+# The index of ``my.ged`` is written beside it as ``my.ged.idx``. The version is
+# raised whenever the format changes, so that older indexes are rebuilt.
+_INDEX_SUFFIX = ".idx"
+_INDEX_VERSION = 1
+
+# a level 0 line after the end of the one before it; group 1 is the line
+_RECORD_LINE = re.compile(rb"[\r\n](0 [^\r\n]*)")
+_EOL = re.compile(rb"\r\n|\r|\n")
+
+
+class _Span(NamedTuple):
+    """Where a record lies in the file, and what the scan learned of it."""
+
+    xref: str | None
+    tag: str
+    start: int
+    end: int
+    # a hash of the record's bytes, kept by an index to check they are unchanged
+    digest: str | None = None
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class LazyDataset:
+    """A dataset whose records are parsed from its file when first asked for.
+
+    Returned by :func:`open`::
+
+        with gedcom7.open("big.ged") as dataset:
+            person = dataset["@I123@"]
+            for family in dataset.records("FAM"):
+                ...
+
+    Records are :class:`~gedcom7.types.GedcomStructure` trees like those
+    :func:`~gedcom7.load` returns. The ``cache_size`` most recently used are
+    kept; asking for one evicted from the cache parses it afresh, as a new tree.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        cache_size: int = 1024,
+        index: bool = False,
+    ) -> None:
+        """Scan the file's level 0 lines, or read them from its index."""
+        self._path = os.fspath(path)
+        # The map holds a file descriptor of its own, so the file need not stay
+        # open; an empty file cannot be mapped, and is no dataset anyway.
+        with builtins.open(path, "rb") as fp:
+            stat = os.fstat(fp.fileno())
+            try:
+                self._buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise GedcomParseError(
+                    "a dataset must contain a header and a trailer"
+                ) from None
+        self._cache: collections.OrderedDict[int, GedcomStructure] = (
+            collections.OrderedDict()
+        )
+        self._cache_size = cache_size
+        try:
+            spans = self._read_index(stat) if index else None
+            if spans is None:
+                self._scan(digests=index)
+                if index:
+                    self._write_index(stat)
+            else:
+                self._spans = spans
+                self._parse_head(spans[0].end)
+            self._xrefs = {
+                span.xref: i for i, span in enumerate(self._spans) if span.xref
+            }
+            self._tags: dict[str, list[int]] = {}
+            for i, span in enumerate(self._spans):
+                self._tags.setdefault(span.tag, []).append(i)
+        except BaseException:
+            self.close()
+            raise
+
+    def _parse_head(self, end: int) -> None:
+        self._schema: dict[str, list[str]] = {}
+        records, _ = parser._parse_span(self._buffer[:end], 0, self._schema)
+        if not records:
+            # a file of no more than a byte-order mark holds no records
+            raise GedcomParseError("a dataset must contain a header and a trailer")
+        self.head = records[0]
+
+    def _scan(self, digests: bool) -> None:
+        buffer = self._buffer
+        first = parser._RECORD_START.search(buffer)
+        head_end = len(buffer) if first is None else first.start() + 1
+        self._parse_head(head_end)
+
+        starts = [0]
+        xrefs: list[str | None] = [None]
+        tags = [self.head.tag]
+        seen = set()
+        for match in _RECORD_LINE.finditer(buffer, head_end - 1):
+            start = match.start(1)
+            text = match.group(1).decode("utf-8", errors="replace")
+            parts = parser._lex(text)
+            if parts is None:
+                raise GedcomParseError(
+                    f"malformed line: {text!r}",
+                    line_number=self._line_number(start),
+                    line=text,
+                )
+            _, xref, tag, _, _ = parts
+            if xref is not None:
+                if xref in seen:
+                    raise GedcomParseError(
+                        f"duplicate cross-reference identifier {xref}",
+                        line_number=self._line_number(start),
+                        line=text,
+                    )
+                seen.add(xref)
+            uris = self._schema.get(tag)
+            starts.append(start)
+            xrefs.append(xref)
+            tags.append(uris[0] if uris is not None and len(uris) == 1 else tag)
+        ends = [*starts[1:], len(buffer)]
+        self._spans = [
+            _Span(
+                xref,
+                tag,
+                start,
+                end,
+                _digest(buffer[start:end]) if digests else None,
+            )
+            for xref, tag, start, end in zip(xrefs, tags, starts, ends, strict=True)
+        ]
+
+        last = self._record(len(self._spans) - 1)
+        parser._check_ends(self.head.tag, last.tag, not (last.text or last.children))
+
+    def _index_path(self) -> str:
+        return self._path + _INDEX_SUFFIX
+
+    def _read_index(self, stat: os.stat_result) -> list[_Span] | None:
+        """Read the spans from the index, or None if it is missing or stale."""
+        try:
+            with builtins.open(self._index_path(), encoding="utf-8") as fp:
+                content = json.load(fp)
+            if (
+                content["version"] != _INDEX_VERSION
+                or content["size"] != stat.st_size
+                or content["mtime_ns"] != stat.st_mtime_ns
+            ):
+                return None
+            tags = content["tags"]
+            return [
+                _Span(xref, tags[tag], start, end, digest)
+                for xref, tag, start, end, digest in content["records"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            return None
+
+    def _write_index(self, stat: os.stat_result) -> None:
+        """Write the spans to the index, if the file's directory allows it.
+
+        The index is written to a temporary file first and moved into place, so
+        a process opening the dataset meanwhile reads either no index or a whole
+        one.
+        """
+        tags = list(dict.fromkeys(span.tag for span in self._spans))
+        numbers = {tag: i for i, tag in enumerate(tags)}
+        content = {
+            "version": _INDEX_VERSION,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "tags": tags,
+            "records": [
+                [span.xref, numbers[span.tag], span.start, span.end, span.digest]
+                for span in self._spans
+            ],
+        }
+        index_path = self._index_path()
+        try:
+            fd, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(index_path) or ".", suffix=".tmp"
+            )
+        except OSError:
+            return
+        try:
+            with builtins.open(fd, "w", encoding="utf-8") as fp:
+                json.dump(content, fp, separators=(",", ":"))
+            os.replace(temporary, index_path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temporary)
+
+    def _line_number(self, offset: int) -> int:
+        """Count the lines before an offset, to number the line starting there."""
+        return sum(1 for _ in _EOL.finditer(self._buffer, 0, offset)) + 1
+
+    def _parse(self, index: int) -> GedcomStructure:
+        span = self._spans[index]
+        data = self._buffer[span.start : span.end]
+        if span.digest is not None and _digest(data) != span.digest:
+            with contextlib.suppress(OSError):
+                os.remove(self._index_path())
+            raise GedcomError(
+                f"{self._path} has changed since it was indexed; open it again"
+            )
+        try:
+            records, _ = parser._parse_span(data, span.start, self._schema)
+        except GedcomParseError as exc:
+            raise parser._renumber(exc, self._line_number(span.start) - 1) from exc
+        return records[0]
+
+    def _record(self, index: int) -> GedcomStructure:
+        if index == 0:
+            return self.head
+        cache = self._cache
+        record = cache.get(index)
+        if record is None:
+            record = cache[index] = self._parse(index)
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(index)
+        return record
+
+    def __getitem__(self, xref: str) -> GedcomStructure:
+        """Get the record with a cross-reference identifier."""
+        return self._record(self._xrefs[xref])
+
+    def __contains__(self, xref: object) -> bool:
+        """Tell whether a record has a cross-reference identifier."""
+        return xref in self._xrefs
+
+    def __len__(self) -> int:
+        """Count the records, HEAD and TRLR included."""
+        return len(self._spans)
+
+    def __iter__(self) -> Iterator[GedcomStructure]:
+        """Iterate over every record in the order of the file."""
+        for index in range(len(self._spans)):
+            yield self._record(index)
+
+    def records(self, tag: str) -> Iterator[GedcomStructure]:
+        """Iterate over the records with a tag, in the order of the file."""
+        for index in self._tags.get(tag, []):
+            yield self._record(index)
+
+    def close(self) -> None:
+        """Close the file; records already parsed remain usable."""
+        self._buffer.close()
+
+    def __enter__(self) -> LazyDataset:
+        """Return the dataset itself."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the file."""
+        self.close()
+
+
+def open(
+    path: str | os.PathLike[str], *, cache_size: int = 1024, index: bool = False
+) -> LazyDataset:
+    """Open a GEDCOM 7 file for its records to be parsed as they are needed.
+
+    See :class:`LazyDataset`. Close it when done, or use it in a ``with``
+    statement.
+
+    With ``index=True`` the scan of the level 0 lines is saved beside the file,
+    as ``<path>.idx``, and read back by later calls instead of scanning again for
+    as long as the file's size and modification time are unchanged. Each record
+    is hashed too, so that a change the size and time miss is caught when the
+    record is parsed. A directory that cannot be written to just goes without.
+    """
+    return LazyDataset(path, cache_size=cache_size, index=index)
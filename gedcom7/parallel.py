@@ -0,0 +1,327 @@
+"""Parse a large data stream on several processes at once.
+
+A data stream falls apart cleanly at its level 0 lines: no structure reaches
+across a record boundary, and the header schema, the only state one record
+hands to the next, is fixed once HEAD has been read. So HEAD is parsed first,
+the rest of the file is cut into runs of whole records, and each run is parsed
+by a worker process. The checks that span records -- duplicate cross-reference
+identifiers, dangling pointers, and the dataset opening with HEAD and closing
+with TRLR -- are made as the runs are stitched back together, in order.
+
+:func:`load_many` divides the work the other way: many files, each parsed whole
+by one worker process.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import repeat
+from typing import TYPE_CHECKING, cast
+
+from . import binary, compression, parser
+from .exceptions import GedcomParseError
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Generator, Iterable, Iterator
+    from typing import BinaryIO
+
+    from .types import GedcomStructure
+
+# Runs smaller than this are not worth the cost of handing to another process.
+_MIN_RUN = 1 << 20
+
+# Runs per worker: more than one, so a worker given records slower to parse than
+# the rest does not hold up all the others.
+_RUNS_PER_WORKER = 4
+
+# Files handed to each worker at a time: enough to keep it busy between one
+# result and the next, few enough that results are not left waiting in memory.
+_FILES_PER_WORKER = 4
+
+# Zip archives, whose members are loaded rather than the archive itself, and the
+# extension of the members loaded.
+_ARCHIVES = (".zip", ".gdz")
+_MEMBERS = ".ged"
+
+_Run = tuple[
+    list["GedcomStructure"],
+    dict[str, int],
+    list[tuple[str, int]],
+    int,
+    GedcomParseError | None,
+]
+
+
+def _cut(buffer: mmap.mmap, start: int, runs: int) -> list[int]:
+    """Return the offsets at which to cut a buffer into runs of whole records.
+
+    The buffer is divided evenly from ``start`` and each cut moved forward to the
+    next record boundary; the list opens with ``start`` and closes with the end
+    of the buffer.
+    """
+    size = len(buffer)
+    cuts = [start]
+    for run in range(1, runs):
+        target = start + (size - start) * run // runs
+        match = parser._RECORD_START.search(buffer, max(target, cuts[-1]))
+        if match is None:
+            break
+        cuts.append(match.start() + 1)
+    cuts.append(size)
+    return cuts
+
+
+def _parse_run(
+    path: str | os.PathLike[str],
+    start: int,
+    end: int,
+    schema: dict[str, list[str]],
+) -> _Run:
+    """Parse the records between two offsets of a file.
+
+    Returns the records, the cross-reference identifiers and unresolved pointers
+    with the numbers of their lines, the number of lines, and the parse error the
+    run holds, if any. Line numbers count from the start of the run. ``schema``
+    is filled in by a run holding HEAD.
+
+    The error is returned rather than raised, with the cross-reference
+    identifiers of the lines before it, so that a duplicate of one found in an
+    earlier run, which comes first in the file, is reported first.
+    """
+    with open(path, "rb") as fp:
+        fp.seek(start)
+        data = fp.read(end - start)
+    builder = parser._Builder(schema)
+    try:
+        records = parser._build_span(builder, data, start)
+    except GedcomParseError as exc:
+        return [], builder.xrefs, [], builder.number, exc
+    return records, builder.xrefs, builder.pointers, builder.number, None
+
+
+def _cuts(path: str | os.PathLike[str], workers: int) -> list[int] | None:
+    """Return the offsets to cut a file into runs at, the first ending HEAD.
+
+    Returns None if the file is better loaded whole, in this process: with one
+    worker, if it is compressed, too small to be worth dividing, or if it has no
+    record after its first.
+    """
+    with open(path, "rb") as fp:
+        size = os.fstat(fp.fileno()).st_size
+        if workers == 1 or size < 2 * _MIN_RUN:
+            return None
+        compressed = compression.reader(fp, path)
+        if compressed is not None:
+            compressed.close()
+            return None
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            match = parser._RECORD_START.search(buffer)
+            if match is None:
+                return None
+            head_end = match.start() + 1
+            runs = min(workers * _RUNS_PER_WORKER, (size - head_end) // _MIN_RUN)
+            return [0, *_cut(buffer, head_end, max(runs, 1))]
+
+
+def load(
+    path: str | os.PathLike[str], *, workers: int | None = None
+) -> list[GedcomStructure]:
+    """Load a GEDCOM 7 dataset from a file, parsing it on several processes.
+
+    ::
+
+        records = gedcom7.parallel.load("big.ged", workers=8)
+
+    The result, and any error raised, is that of :func:`gedcom7.load_path`.
+    ``workers`` defaults to the number of CPUs. A file too small to be worth
+    dividing, or compressed, is loaded by :func:`gedcom7.load_path` in this
+    process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, not {workers}")
+
+    cuts = _cuts(path, workers)
+    if cuts is None:
+        return parser.load_path(path)
+
+    schema: dict[str, list[str]] = {}
+    records, xrefs, pointers, offset, error = _parse_run(path, 0, cuts[1], schema)
+    if error is not None:
+        raise error
+    first = records[0].tag if records else None
+
+    with ProcessPoolExecutor(min(workers, len(cuts) - 2)) as executor:
+        results = executor.map(
+            _parse_run, repeat(path), cuts[1:], cuts[2:], repeat(schema)
+        )
+        # Every error raised in this loop, whether by a worker or by the checks
+        # across runs, numbers its line from the start of the run at hand;
+        # ``offset`` is the number of lines before that run.
+        try:
+            for run, run_xrefs, run_pointers, lines, error in results:
+                for xref, number in run_xrefs.items():
+                    if xref in xrefs:
+                        raise GedcomParseError(
+                            f"duplicate cross-reference identifier {xref}",
+                            line_number=number,
+                        )
+                    xrefs[xref] = number + offset
+                if error is not None:
+                    raise error
+                pointers.extend((pointer, n + offset) for pointer, n in run_pointers)
+                records.extend(run)
+                offset += lines
+        except GedcomParseError as exc:
+            raise parser._renumber(exc, offset) from exc
+
+    parser._check_pointers(pointers, xrefs)
+    last = records[-1]
+    parser._check_ends(first, last.tag, not (last.text or last.children))
+    return records
+
+
+def _files(
+    paths: Iterable[str | os.PathLike[str]],
+) -> Iterator[
+    tuple[str | os.PathLike[str], str | os.PathLike[str], str | Exception | None]
+]:
+    """Yield the name to report, the file and the archive member of each dataset.
+
+    In place of the member is the error raised listing an archive that cannot
+    be read.
+    """
+    for path in paths:
+        if not os.fspath(path).lower().endswith(_ARCHIVES):
+            yield path, path, None
+            continue
+        try:
+            with zipfile.ZipFile(path) as archive:
+                names = archive.namelist()
+        except (OSError, zipfile.BadZipFile) as exc:
+            yield path, path, exc
+            continue
+        for name in names:
+            if name.lower().endswith(_MEMBERS):
+                yield os.path.join(path, name), path, name
+
+
+def _load_file(
+    path: str | os.PathLike[str],
+    member: str | None,
+    include_records: Collection[str] | None,
+    exclude_records: Collection[str] | None,
+) -> list[GedcomStructure]:
+    if member is None:
+        return parser.load_path(
+            path, include_records=include_records, exclude_records=exclude_records
+        )
+    with zipfile.ZipFile(path) as archive, archive.open(member) as fp:
+        return parser.load(
+            cast("BinaryIO", fp),
+            include_records=include_records,
+            exclude_records=exclude_records,
+        )
+
+
+def _load_binary(
+    path: str | os.PathLike[str],
+    member: str | None,
+    include_records: Collection[str] | None,
+    exclude_records: Collection[str] | None,
+) -> bytes:
+    """Load a file in a worker, and return the records in their binary form.
+
+    The binary form is quicker to make and to read than pickles of the trees,
+    which would be taken apart and put together again one object at a time.
+    """
+    return binary.dumps(_load_file(path, member, include_records, exclude_records))
+
+
+def load_many(
+    paths: Iterable[str | os.PathLike[str]],
+    *,
+    workers: int | None = None,
+    include_records: Collection[str] | None = None,
+    exclude_records: Collection[str] | None = None,
+) -> Generator[
+    tuple[str | os.PathLike[str], list[GedcomStructure] | Exception], None, None
+]:
+    """Load many files on several processes, yielding each as it is loaded.
+
+    ::
+
+        for path, records in gedcom7.load_many(paths, workers=8):
+            if isinstance(records, Exception):
+                print(f"{path}: {records}")
+
+    Yields the path of each file and its records, as loaded by
+    :func:`gedcom7.load_path`, or the exception loading it raised, in the order
+    the files are done rather than the order given. A compressed file is
+    decompressed; a zip archive, ending ``.zip`` or ``.gdz``, stands for each of
+    its members ending ``.ged``, under the path of the archive joined with the
+    member's name. ``workers`` defaults to the number of CPUs; with 1, the files
+    are loaded one after another in this process.
+
+    Each worker process is started once, and loads file after file. It sends
+    back the records in the binary form of :mod:`gedcom7.binary`; records so
+    loaded share each distinct string, as if loaded with ``intern=True``. Close
+    the generator to stop early: files not yet begun are then not loaded.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, not {workers}")
+    files = _files(paths)
+    if workers == 1:
+        for name, path, member in files:
+            if isinstance(member, Exception):
+                yield name, member
+                continue
+            try:
+                records = _load_file(path, member, include_records, exclude_records)
+            except Exception as exc:
+                yield name, exc
+            else:
+                yield name, records
+        return
+
+    executor = ProcessPoolExecutor(workers)
+    pending: dict[Future[bytes], str | os.PathLike[str]] = {}
+    try:
+        for name, path, member in files:
+            if isinstance(member, Exception):
+                yield name, member
+                continue
+            if len(pending) >= workers * _FILES_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from _results(done, pending)
+            future = executor.submit(
+                _load_binary, path, member, include_records, exclude_records
+            )
+            pending[future] = name
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from _results(done, pending)
+    finally:
+        # If the caller stops early, the files not yet begun are not loaded.
+        executor.shutdown(cancel_futures=True)
+
+
+def _results(
+    done: set[Future[bytes]], pending: dict[Future[bytes], str | os.PathLike[str]]
+) -> Iterator[tuple[str | os.PathLike[str], list[GedcomStructure] | Exception]]:
+    """Yield the name and the records, or the error, of each file done."""
+    for future in done:
+        name = pending.pop(future)
+        exc = future.exception()
+        if exc is None:
+            yield name, binary.loads(future.result())
+        elif isinstance(exc, Exception):
+            yield name, exc
+        else:
+            raise exc
@@ -2,25 +2,68 @@
 
 from __future__ import annotations
 
+import abc
+import codecs
+import collections
+import io
+import mmap as _mmap
+import os
 import re
-from typing import TYPE_CHECKING
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    Literal,
+    NoReturn,
+    Protocol,
+    TypeVar,
+    overload,
+)
 
-from . import const, grammar
+from . import cache, compression, const, grammar
+from .dataset import Dataset
 from .exceptions import GedcomParseError
-from .types import GedcomStructure
+from .types import Event, GedcomStructure
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Collection, Container, Iterable, Iterator
     from typing import BinaryIO
 
+    # tests a record's tag, given the header schema, for whether to keep it
+    _Keep = Callable[[str, dict[str, list[str]]], bool]
+
 # EOL = %x0D [%x0A] / %x0A -- CR-LF, CR, or LF
 _EOL = re.compile(r"\r\n|\r|\n")
 _LINE = re.compile(grammar.line)
 _BANNED = re.compile(grammar.banned)
 _TAGDEF = re.compile(grammar.tagdef)
 
+# The ASCII-only subset of the line grammar that nearly every line falls in, for
+# _lex to check the parts of a line against without running _LINE over all of it.
+_FAST_TAG = re.compile(r"[A-Z][A-Z0-9_]*|_[A-Z0-9_]+")
+_FAST_XREF = re.compile(r"@[A-Z0-9_]+@")
+
 # U+FEFF, the byte-order mark, may open a data stream and carries no meaning
 _BOM = "\ufeff"
 
+# bytes read from a file object at a time by iterparse
+_CHUNK_SIZE = 1 << 16
+
+# characters of text split into lines at a time by _Splitter
+_BLOCK_SIZE = 1 << 16
+
+# With intern=True, payloads up to _TEXT_LENGTH characters long are shared
+# through a table of at most _TEXTS_SIZE of them, emptied whenever it fills.
+_TEXT_LENGTH = 128
+_TEXTS_SIZE = 1 << 16
+
+# The end of a line followed by a level 0 line: where one record ends and the
+# next begins. Neither CR nor LF occurs inside a multi-byte UTF-8 sequence, so
+# this finds record boundaries in the raw bytes without decoding them.
+_RECORD_START = re.compile(rb"[\r\n]0 ")
+_RECORD_START_TEXT = re.compile(r"[\r\n]0 ")
+
 
 def _unescape(linestr: str) -> str:
     """Undo the escaping of a line string's leading "@".
@@ -32,91 +75,345 @@ def _unescape(linestr: str) -> str:
     return linestr[1:] if linestr.startswith("@@") else linestr
 
 
-def load(fp: BinaryIO) -> list[GedcomStructure]:
-    """Load a GEDCOM 7 dataset from a binary file object.
+def _lex(text: str) -> tuple[int, str | None, str, str | None, str | None] | None:
+    """Split a line into its level, xref, tag, pointer and line string.
 
-    The file must be opened in binary mode, e.g. ``open(path, "rb")``. GEDCOM 7
-    data streams are always UTF-8, and reading the bytes directly avoids the
-    encoding guesswork and newline translation that text mode would apply.
+    A line is cut at its first spaces and the parts checked against the small
+    patterns above, which decide the common case far faster than matching the
+    whole of :data:`_LINE`. Anything they do not settle -- including every
+    malformed line -- falls back to the full grammar, which has the final say.
+    Returns None if the line does not match the grammar.
+
+    Payload characters need no check here: the only ones ``lineStr`` excludes
+    are banned or end a line, and both have been dealt with by :func:`_split`.
     """
-    data = fp.read()
-    try:
-        string = data.decode("utf-8")
-    except AttributeError:
-        raise TypeError(
-            'File must be opened in binary mode, e.g. use `open("my.ged", "rb")`'
-        ) from None
-    except UnicodeDecodeError as exc:
-        raise GedcomParseError(f"data stream is not valid UTF-8: {exc}") from exc
-    return loads(string)
+    level, _, rest = text.partition(" ")
+    if level.isascii() and level.isdigit() and (level == "0" or level[0] != "0"):
+        xref = None
+        if rest.startswith("@"):
+            xref, _, rest = rest.partition(" ")
+        tag, delimiter, linestr = rest.partition(" ")
+        if (xref is None or _FAST_XREF.fullmatch(xref)) and _FAST_TAG.fullmatch(tag):
+            if not delimiter:
+                return int(level), xref, tag, None, None
+            if linestr and linestr[0] != "@":
+                return int(level), xref, tag, None, linestr
+            if _FAST_XREF.fullmatch(linestr):
+                return int(level), xref, tag, linestr, None
 
+    match = _LINE.fullmatch(text + "\n")
+    if match is None:
+        return None
+    return (
+        int(match.group("level")),
+        match.group("xref"),
+        match.group("tag"),
+        match.group("pointer"),
+        match.group("linestr"),
+    )
 
-def loads(string: str) -> list[GedcomStructure]:
-    """Load a GEDCOM 7 dataset from a string.
 
-    Raises :class:`~gedcom7.exceptions.GedcomParseError` if the data stream does
-    not conform to the specification. Non-conforming lines are never skipped.
+class _Decoder:
+    """Decode UTF-8 bytes arriving in pieces.
+
+    The decoder is incremental, so a character whose bytes straddle two pieces is
+    held back until the rest of it has arrived. ``offset`` is the position of the
+    first byte within the data stream, to place errors by.
+    """
+
+    def __init__(self, offset: int = 0) -> None:
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.offset = offset
+
+    def decode(self, data: bytes, final: bool = False) -> str:
+        """Decode the next piece, and with ``final`` anything held back."""
+        try:
+            text = self.decoder.decode(data, final)
+        except UnicodeDecodeError as exc:
+            # exc.start counts from the bytes the decoder was still holding back
+            held = len(exc.object) - len(data)
+            raise GedcomParseError(
+                "data stream is not valid UTF-8: byte "
+                f"{exc.object[exc.start]:#04x} at offset "
+                f"{self.offset - held + exc.start}: {exc.reason}"
+            ) from exc
+        self.offset += len(data)
+        return text
+
+
+def _decode(fp: BinaryIO | _mmap.mmap, offset: int = 0) -> Iterator[str]:
+    """Read a binary file object in chunks and decode them as UTF-8.
+
+    Everything is decoded, payloads included, before any of it is parsed. Every
+    byte has to be checked to be valid UTF-8 either way, and the codec checks
+    and decodes in one pass of C, at a small fraction of the cost of parsing:
+    left as bytes, the payloads would save next to nothing, and the tags and
+    pointers, needed as text, would have to be decoded line by line.
     """
-    string = string.removeprefix(_BOM)
+    decoder = _Decoder(offset)
+    while True:
+        data = fp.read(_CHUNK_SIZE)
+        try:
+            text = decoder.decode(data, final=not data)
+        except TypeError:
+            raise TypeError(
+                'File must be opened in binary mode, e.g. use `open("my.ged", "rb")`'
+            ) from None
+        yield text
+        if not data:
+            return
+
+
+class _Splitter:
+    """Split text arriving in pieces into lines, without their terminators.
+
+    Each piece is split in blocks of whole lines, scanned and cut by
+    :meth:`str.splitlines` in one pass of C, rather than line by line in Python.
+    A piece holding a whole data stream is thus never copied line by line all at
+    once, only a block of it at a time.
 
-    banned = _BANNED.search(string)
-    if banned:
+    Banned characters are looked for a block at a time, but reported at their
+    line: the lines before it are handed on first, so errors are reported in the
+    order of the lines they are on, however the text is divided into pieces.
+    """
+
+    def __init__(self) -> None:
+        # the start of a line whose terminator has not arrived yet
+        self.pending = ""
+        self.number = 0
+        self.started = False
+        # Set to pass over the lines up to the next level 0 line, unread, which
+        # takes effect from the next line to be cut.
+        self.skipping = False
+
+    def feed(self, chunk: str) -> Iterator[str]:
+        """Yield the lines a piece completes; to be run through before the next."""
+        if not self.started and chunk:
+            chunk = chunk.removeprefix(_BOM)
+            self.started = True
+        text = self.pending + chunk
+        # A CR ending the piece may be the first half of a CR-LF whose LF opens
+        # the next one, so it is left pending with the line it ends.
+        end = len(text) - 1 if text.endswith("\r") else len(text)
+        start = 0
+        while True:
+            if self.skipping:
+                after = self._skip(text, start)
+                if after is None:
+                    return
+                start = after
+            cut = self._cut(text, start, end)
+            if cut is None:
+                break
+            banned = _BANNED.search(text, start, cut)
+            if banned:
+                # the block is cut short before the line holding the character
+                cut = max(
+                    start,
+                    text.rfind("\n", start, banned.start()) + 1,
+                    text.rfind("\r", start, banned.start()) + 1,
+                )
+            block = text[start:cut]
+            start = cut
+            # str.splitlines runs in C, but also splits at the few separators
+            # besides CR and LF that are not banned, which a block with one in
+            # it has to be split at its EOLs instead
+            if "\u2028" in block or "\u2029" in block:
+                lines = _EOL.split(block)
+                lines.pop()
+            else:
+                lines = block.splitlines()
+            for line in lines:
+                if self.skipping:
+                    if not line.startswith("0 "):
+                        self.number += 1
+                        continue
+                    self.skipping = False
+                self.number += 1
+                yield line
+            if banned:
+                self._banned(banned)
+        self.pending = text[start:]
+
+    def _banned(self, banned: re.Match[str], skipped: str = "") -> NoReturn:
+        """Raise the error for a banned character, ``skipped`` lines after the last.
+
+        ``skipped`` is the text passed over from the end of the last line counted
+        to the character.
+        """
         raise GedcomParseError(
             f"banned character U+{ord(banned.group()):04X} in data stream",
-            line_number=string.count("\n", 0, banned.start()) + 1,
+            line_number=self.number + len(_EOL.findall(skipped)) + 1,
+        )
+
+    @staticmethod
+    def _cut(text: str, start: int, end: int) -> int | None:
+        """Find where to end a block of whole lines beginning at ``start``.
+
+        Blocks are about :data:`_BLOCK_SIZE` long, so that splitting one into
+        lines never copies a large piece out line by line all at once. Returns
+        None if no line ends between ``start`` and ``end``.
+        """
+        limit = min(start + _BLOCK_SIZE, end)
+        cut = max(text.rfind("\n", start, limit), text.rfind("\r", start, limit)) + 1
+        if cut == 0:
+            # a line longer than a block, or no more whole lines
+            eol = _EOL.search(text, limit, end)
+            if eol is None:
+                return None
+            cut = eol.end()
+        elif text.startswith("\n", cut) and text[cut - 1] == "\r":
+            cut += 1
+        return cut
+
+    def _skip(self, text: str, start: int) -> int | None:
+        """Pass over the lines from ``start`` to the next level 0 line.
+
+        Returns where that line begins, or None if the piece runs out first. The
+        lines passed over are counted, but not cut out or looked at one by one.
+        """
+        if text.startswith("0 ", start):
+            self.skipping = False
+            return start
+        boundary = _RECORD_START_TEXT.search(text, start)
+        if boundary is not None:
+            end = boundary.start() + 1
+            self.skipping = False
+        else:
+            # The last line may be a level 0 line whose end has not arrived, and
+            # a CR ending the piece may be the first half of a CR-LF.
+            end = max(start, text.rfind("\n", start) + 1, text.rfind("\r", start) + 1)
+            if start < end == len(text) and text.endswith("\r"):
+                end -= 1
+            self.pending = text[end:]
+        banned = _BANNED.search(text, start, end)
+        if banned:
+            self._banned(banned, text[start : banned.start()])
+        self.number += (
+            text.count("\n", start, end)
+            + text.count("\r", start, end)
+            - text.count("\r\n", start, end)
         )
+        return end if boundary is not None else None
+
+    def close(self) -> Iterator[str]:
+        """Yield the last line, if it lacks a terminator."""
+        banned = _BANNED.search(self.pending)
+        if banned:
+            self._banned(banned)
+        if self.skipping and not self.pending.startswith("0 "):
+            self.pending = ""
+        # A data stream whose last line lacks its EOL is tolerated: the line is
+        # complete and unambiguous, and dropping it would silently lose data.
+        if self.pending:
+            self.number += 1
+            yield self.pending.removesuffix("\r")
+            self.pending = ""
+
+
+def _split(chunks: Iterable[str], splitter: _Splitter | None = None) -> Iterator[str]:
+    """Split text arriving in pieces into lines."""
+    if splitter is None:
+        splitter = _Splitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.close()
+
+
+class _Node(Protocol):
+    """What the line state machine needs of whatever it builds for a line."""
+
+    tag: str
+    pointer: str | None
+    text: str
+
+
+_N = TypeVar("_N", bound=_Node)
+
+
+_intern = sys.intern
+
+
+class _Lines(abc.ABC, Generic[_N]):
+    """The state carried from one line of a data stream to the next.
 
-    lines = _EOL.split(string)
-    # A terminating EOL leaves a final empty element that is not itself a line.
-    # A data stream whose last line lacks its EOL is tolerated: the line is
-    # complete and unambiguous, and dropping it would silently lose data.
-    if lines and lines[-1] == "":
-        lines.pop()
-
-    records: list[GedcomStructure] = []
-    # stack[i] is the structure encoded by the nearest preceding line of level i
-    stack: list[GedcomStructure] = []
-    # extension tag -> URIs declared for it by the header schema
-    schema: dict[str, list[str]] = {}
-    xrefs: set[str] = set()
-    pointers: list[tuple[str, int]] = []
-    # the structure a CONT on the very next line would continue
-    continuable: GedcomStructure | None = None
-
-    for number, text in enumerate(lines, start=1):
-        match = _LINE.fullmatch(text + "\n")
-        if match is None:
+    Lines are passed to :meth:`line` in order, and every rule binding one line to
+    those around it is checked here. What each line becomes is left to
+    :meth:`open`, and what becomes of structures once their last line has been
+    seen, to :meth:`close`.
+    """
+
+    def __init__(
+        self, schema: dict[str, list[str]] | None = None, *, intern: bool = False
+    ) -> None:
+        self.number = 0
+        # stack[i] is what was built for the nearest preceding line of level i
+        self.stack: list[_N] = []
+        # extension tag -> URIs declared for it by the header schema
+        self.schema: dict[str, list[str]] = {} if schema is None else schema
+        # cross-reference identifier -> the number of the line it is on
+        self.xrefs: dict[str, int] = {}
+        # pointers not yet matched by a cross-reference identifier, with the
+        # number of the line each was found on
+        self.pointers: list[tuple[str, int]] = []
+        # the tag of the first record, which must be HEAD
+        self.first: str | None = None
+        # payloads seen lately, each mapped to itself, to share rather than copy
+        self.texts: dict[str, str] | None = {} if intern else None
+
+    @abc.abstractmethod
+    def open(
+        self, level: int, xref: str | None, tag: str, pointer: str | None, text: str
+    ) -> _N:
+        """Build what a line stands for, now that it is known to be valid."""
+
+    @abc.abstractmethod
+    def close(self, level: int) -> Any:
+        """Finish with the structures at ``level`` and deeper, before a new line.
+
+        Called before the line is added, with the structures still on the stack.
+        Whatever it returns, :meth:`line` returns.
+        """
+
+    def line(self, text: str) -> Any:
+        """Add a line, returning what :meth:`close` made of it, if anything."""
+        self.number += 1
+        number = self.number
+        stack = self.stack
+
+        parts = _lex(text)
+        if parts is None:
             raise GedcomParseError(
                 f"malformed line: {text!r}", line_number=number, line=text
             )
 
-        level = int(match.group("level"))
-        tag = match.group("tag")
-        xref = match.group("xref")
-        pointer = match.group("pointer")
-        linestr = match.group("linestr")
+        level, xref, tag, pointer, linestr = parts
         payload = _unescape(linestr) if linestr is not None else ""
+        texts = self.texts
+        if texts is not None and 0 < len(payload) <= _TEXT_LENGTH:
+            if len(texts) >= _TEXTS_SIZE:
+                texts.clear()
+            payload = texts.setdefault(payload, payload)
 
         if tag == const.CONT:
-            if (
-                continuable is None
-                or level != len(stack)
-                or stack[-1] is not continuable
-            ):
+            # Each line opens the structure it encodes, so the one a CONT
+            # continues is always the one on top of the stack.
+            if level != len(stack) or not stack:
                 raise GedcomParseError(
                     "CONT must immediately follow the line it continues, at one "
                     "greater level, and before any other substructure",
                     line_number=number,
                     line=text,
                 )
-            if continuable.pointer:
+            continued = stack[-1]
+            if continued.pointer:
                 raise GedcomParseError(
                     "CONT cannot continue a pointer payload",
                     line_number=number,
                     line=text,
                 )
-            continuable.text += "\n" + payload
-            continue
+            continued.text += "\n" + payload
+            return None
 
         if level > len(stack):
             if not stack:
@@ -131,9 +428,16 @@ def loads(string: str) -> list[GedcomStructure]:
                 line_number=number,
                 line=text,
             )
+        closed = self.close(level)
         del stack[level:]
 
+        # The same few tags and pointers recur throughout a dataset; interned,
+        # each is held once however many structures have it.
+        tag = _intern(tag)
+        if pointer is not None:
+            pointer = _intern(pointer)
         if xref is not None:
+            xref = _intern(xref)
             if level != 0:
                 raise GedcomParseError(
                     "only records may have a cross-reference identifier",
@@ -146,24 +450,13 @@ def loads(string: str) -> list[GedcomStructure]:
                     line_number=number,
                     line=text,
                 )
-            if xref in xrefs:
+            if xref in self.xrefs:
                 raise GedcomParseError(
                     f"duplicate cross-reference identifier {xref}",
                     line_number=number,
                     line=text,
                 )
-            xrefs.add(xref)
-
-        # A documented extension tag stands for its URI. A tag the schema maps to
-        # several URIs cannot be disambiguated without the extension's own
-        # documentation, so it is left as the tag.
-        uris = schema.get(tag)
-        structure = GedcomStructure(
-            tag=uris[0] if uris is not None and len(uris) == 1 else tag,
-            pointer=pointer,
-            xref=xref,
-            text=payload,
-        )
+            self.xrefs[xref] = number
 
         if (
             tag == const.TAG
@@ -171,28 +464,138 @@ def loads(string: str) -> list[GedcomStructure]:
             and stack[0].tag == const.HEAD
             and stack[1].tag == const.SCHMA
         ):
-            tagdef = _TAGDEF.fullmatch(structure.text)
+            tagdef = _TAGDEF.fullmatch(payload)
             if tagdef is None:
                 raise GedcomParseError(
                     "a tag definition must be an extension tag, a space, and a "
-                    f"URI, found {structure.text!r}",
+                    f"URI, found {payload!r}",
                     line_number=number,
                     line=text,
                 )
-            schema.setdefault(tagdef.group("exttag"), []).append(tagdef.group("uri"))
+            self.schema.setdefault(tagdef.group("exttag"), []).append(
+                tagdef.group("uri")
+            )
+
+        # A documented extension tag stands for its URI. A tag the schema maps to
+        # several URIs cannot be disambiguated without the extension's own
+        # documentation, so it is left as the tag.
+        uris = self.schema.get(tag)
+        if uris is not None and len(uris) == 1:
+            tag = uris[0]
+        if level == 0 and self.first is None:
+            self.first = tag
+        stack.append(self.open(level, xref, tag, pointer, payload))
 
-        if level == 0:
-            records.append(structure)
+        if (
+            pointer is not None
+            and pointer != const.VOIDPTR
+            and pointer not in self.xrefs
+        ):
+            self.pointers.append((pointer, number))
+
+        return closed
+
+    def check(self) -> None:
+        """Check what can only be checked once the data stream has ended."""
+        _check_pointers(self.pointers, self.xrefs)
+        stack = self.stack
+        if stack:
+            # Only a new record takes the stack back down to one structure.
+            _check_ends(self.first, stack[0].tag, not stack[0].text and len(stack) == 1)
         else:
-            stack[level - 1].append_child(structure)
-        stack.append(structure)
-        continuable = structure
+            _check_ends(self.first, None)
+
+
+class _Builder(_Lines[GedcomStructure]):
+    """Build structure trees from lines, returning each record once complete.
 
-        if pointer is not None and pointer != const.VOIDPTR:
-            pointers.append((pointer, number))
+    A record is returned once the line after its last one has been seen, as only
+    then is it known to be complete.
+    """
+
+    def open(
+        self, level: int, xref: str | None, tag: str, pointer: str | None, text: str
+    ) -> GedcomStructure:
+        if not level:
+            return GedcomStructure(tag=tag, pointer=pointer, xref=xref, text=text)
+        # what append_child does, less looking for a dataset to tell: a record
+        # being built belongs to none yet
+        parent = self.stack[level - 1]
+        structure = GedcomStructure(
+            tag=tag, pointer=pointer, xref=xref, text=text, parent=parent
+        )
+        parent.children.append(structure)
+        return structure
+
+    def close(self, level: int) -> GedcomStructure | None:
+        return self.stack[0] if level == 0 and self.stack else None
+
+    def finish(self) -> GedcomStructure:
+        """Check what can only be checked at the end, and return the last record."""
+        self.check()
+        return self.stack[0]
+
+
+_tuple_new = tuple.__new__
+
+
+class _Open:
+    """A structure whose start event awaits the CONT lines that may follow it."""
+
+    __slots__ = ("level", "pointer", "tag", "text", "xref")
+
+    def __init__(
+        self, level: int, xref: str | None, tag: str, pointer: str | None, text: str
+    ) -> None:
+        self.level = level
+        self.xref = xref
+        self.tag = tag
+        self.pointer = pointer
+        self.text = text
 
-    # Pointers may be forward references, so they are resolved once the whole
-    # data stream has been read.
+    def event(self, kind: Literal["start", "end"]) -> Event:
+        # tuple.__new__ skips the argument handling of Event's own __new__, which
+        # would otherwise be a good part of the cost of each event
+        return _tuple_new(
+            Event, (kind, self.level, self.xref, self.tag, self.pointer, self.text)
+        )
+
+
+class _Events(_Lines[_Open]):
+    """Turn lines into start and end events, collected in :attr:`events`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: list[Event] = []
+
+    def open(
+        self, level: int, xref: str | None, tag: str, pointer: str | None, text: str
+    ) -> _Open:
+        return _Open(level, xref, tag, pointer, text)
+
+    def close(self, level: int) -> None:
+        stack = self.stack
+        if not stack:
+            return
+        # Every structure on the stack but the top has had its start event; the
+        # top's was held back until a line other than a CONT showed up.
+        self.events.append(stack[-1].event("start"))
+        for index in range(len(stack) - 1, level - 1, -1):
+            self.events.append(stack[index].event("end"))
+
+    def finish(self) -> None:
+        """Check what can only be checked at the end, and end every structure."""
+        self.check()
+        self.close(0)
+        self.stack.clear()
+
+
+def _check_pointers(pointers: Iterable[tuple[str, int]], xrefs: Container[str]) -> None:
+    """Check that every pointer matches a cross-reference identifier.
+
+    Pointers may be forward references, so they are resolved once the whole data
+    stream has been read.
+    """
     for pointer, number in pointers:
         if pointer not in xrefs:
             raise GedcomParseError(
@@ -201,22 +604,484 @@ def loads(string: str) -> list[GedcomStructure]:
                 line_number=number,
             )
 
-    if not records:
+
+def _check_ends(first: str | None, last: str | None, empty: bool = True) -> None:
+    """Check that a dataset opens with HEAD and closes with an empty TRLR.
+
+    ``first`` and ``last`` are the tags of the first and last records, or None
+    if there were no records at all, and ``empty`` tells whether the last record
+    has neither payload nor substructures.
+    """
+    if last is None:
         raise GedcomParseError("a dataset must contain a header and a trailer")
-    if records[0].tag != const.HEAD:
+    if first != const.HEAD:
         raise GedcomParseError(
-            f"a dataset must begin with a {const.HEAD} pseudo-structure, found "
-            f"{records[0].tag}"
+            f"a dataset must begin with a {const.HEAD} pseudo-structure, found {first}"
         )
-    trailer = records[-1]
-    if trailer.tag != const.TRLR:
+    if last != const.TRLR:
         raise GedcomParseError(
-            f"a dataset must end with a {const.TRLR} pseudo-structure, found "
-            f"{trailer.tag}"
+            f"a dataset must end with a {const.TRLR} pseudo-structure, found {last}"
         )
-    if trailer.text or trailer.children:
+    if not empty:
         raise GedcomParseError(
             f"{const.TRLR} must have no payload and no substructures"
         )
 
+
+def _keeper(
+    include: Collection[str] | None, exclude: Collection[str] | None
+) -> _Keep | None:
+    """Make a test of which records to keep, or None to keep every one.
+
+    The test is given a record's tag and the header schema. A documented
+    extension tag stands for its URI, and is matched by either.
+    """
+    if include is None and exclude is None:
+        return None
+    included = None if include is None else frozenset(include)
+    excluded = frozenset(() if exclude is None else exclude)
+    # tag -> whether its records are kept; the schema is whole by the time any
+    # record but HEAD is tested
+    decided: dict[str, bool] = {}
+
+    def keep(tag: str, schema: dict[str, list[str]]) -> bool:
+        if tag in (const.HEAD, const.TRLR):
+            return True
+        kept = decided.get(tag)
+        if kept is None:
+            names = {tag, *(ext for ext, uris in schema.items() if uris == [tag])}
+            kept = decided[tag] = (
+                included is None or not names.isdisjoint(included)
+            ) and names.isdisjoint(excluded)
+        return kept
+
+    return keep
+
+
+def _parse(
+    chunks: Iterable[str],
+    keep: _Keep | None = None,
+    intern: bool = False,
+) -> Iterator[GedcomStructure]:
+    """Build records from text, yielding each as soon as it is complete.
+
+    A record whose tag ``keep`` rejects is passed over: the splitter skips its
+    lines unread, up to the next level 0 line.
+    """
+    splitter = _Splitter()
+    builder = _Builder(intern=intern)
+    stack = builder.stack
+    schema = builder.schema
+    skipped = False
+    for text in _split(chunks, splitter):
+        if skipped:
+            # the builder numbers the lines it is given; some were not
+            builder.number = splitter.number - 1
+            skipped = False
+        record = builder.line(text)
+        if record is not None and (keep is None or keep(record.tag, schema)):
+            yield record
+        if keep is not None and len(stack) == 1 and not keep(stack[0].tag, schema):
+            splitter.skipping = skipped = True
+    yield builder.finish()
+
+
+def _events(lines: Iterable[str]) -> Iterator[Event]:
+    """Turn lines into events, yielding them as soon as they are known."""
+    builder = _Events()
+    events = builder.events
+    for text in lines:
+        builder.line(text)
+        # handed over in batches: a generator frame per line would cost more
+        # than the events take to make
+        if len(events) >= 256:
+            yield from events
+            events.clear()
+    yield from events
+    events.clear()
+    builder.finish()
+    yield from events
+
+
+def _parse_span(
+    data: bytes, offset: int = 0, schema: dict[str, list[str]] | None = None
+) -> tuple[list[GedcomStructure], _Builder]:
+    """Parse the whole records in a span of a data stream's bytes.
+
+    ``offset`` is where the span begins within the stream, and ``schema`` that
+    declared by a HEAD outside it; a span holding HEAD fills it in. The checks
+    that need the whole stream are not made, but the builder is returned with the
+    records so that the caller can make them. Line numbers, in errors and in the
+    builder, count from the start of the span.
+    """
+    builder = _Builder(schema)
+    return _build_span(builder, data, offset), builder
+
+
+def _build_span(builder: _Builder, data: bytes, offset: int) -> list[GedcomStructure]:
+    """Parse the whole records in a span with a builder, as :func:`_parse_span`.
+
+    Should the span hold an error, the builder is left as it was when the error
+    was raised: it has the cross-reference identifiers of the lines before.
+    """
+    records = []
+    for text in _split(_decode(io.BytesIO(data), offset)):
+        record = builder.line(text)
+        if record is not None:
+            records.append(record)
+    if builder.stack:
+        records.append(builder.stack[0])
     return records
+
+
+def _renumber(exc: GedcomParseError, lines: int) -> GedcomParseError:
+    """Copy an error from a span, counting its line from the stream's start."""
+    return GedcomParseError(
+        exc.message,
+        line_number=None if exc.line_number is None else exc.line_number + lines,
+        line=exc.line,
+    )
+
+
+class IncrementalParser:
+    """Parse a data stream handed over in pieces of any size.
+
+    ::
+
+        parser = gedcom7.IncrementalParser()
+        for data in upload:
+            parser.feed(data)
+            for record in parser.read_records():
+                ...
+        parser.close()
+        for record in parser.read_records():
+            ...
+
+    Partial lines and characters, open CONT continuations and the structures
+    not yet complete are carried from one piece to the next. A malformed line is
+    reported by the :meth:`feed` call that completes it, with the errors and line
+    numbers of :func:`loads`; a parser that has raised cannot be fed further.
+    """
+
+    def __init__(self) -> None:
+        """Start a parser for a new data stream."""
+        self._decoder = _Decoder()
+        self._splitter = _Splitter()
+        self._builder = _Builder()
+        self._records: collections.deque[GedcomStructure] = collections.deque()
+        self._closed = False
+
+    def _add(self, lines: Iterable[str]) -> None:
+        for text in lines:
+            record = self._builder.line(text)
+            if record is not None:
+                self._records.append(record)
+
+    def feed(self, data: bytes) -> None:
+        """Parse the next piece of the data stream's UTF-8 bytes."""
+        if self._closed:
+            raise ValueError("feed() called after close()")
+        try:
+            self._add(self._splitter.feed(self._decoder.decode(data)))
+        except GedcomParseError:
+            self._closed = True
+            raise
+
+    def close(self) -> None:
+        """Mark the end of the data stream, and make the last checks.
+
+        The dangling-pointer check and the check that the dataset ends with TRLR
+        can only be made here, and the last record is only complete once it has
+        been called.
+        """
+        if self._closed:
+            raise ValueError("close() called twice, or after an error")
+        self._closed = True
+        self._add(self._splitter.feed(self._decoder.decode(b"", final=True)))
+        self._add(self._splitter.close())
+        self._records.append(self._builder.finish())
+
+    def read_records(self) -> Iterator[GedcomStructure]:
+        """Yield the records completed so far, each only once."""
+        while self._records:
+            yield self._records.popleft()
+
+
+def _collect(
+    records: Iterable[GedcomStructure], dataset: bool
+) -> list[GedcomStructure] | Dataset:
+    return Dataset(records) if dataset else list(records)
+
+
+@overload
+def load(
+    fp: BinaryIO,
+    *,
+    include_records: Collection[str] | None = ...,
+    exclude_records: Collection[str] | None = ...,
+    intern: bool = ...,
+    dataset: Literal[False] = ...,
+) -> list[GedcomStructure]: ...
+
+
+@overload
+def load(
+    fp: BinaryIO,
+    *,
+    include_records: Collection[str] | None = ...,
+    exclude_records: Collection[str] | None = ...,
+    intern: bool = ...,
+    dataset: Literal[True],
+) -> Dataset: ...
+
+
+def load(
+    fp: BinaryIO,
+    *,
+    include_records: Collection[str] | None = None,
+    exclude_records: Collection[str] | None = None,
+    intern: bool = False,
+    dataset: bool = False,
+) -> list[GedcomStructure] | Dataset:
+    """Load a GEDCOM 7 dataset from a binary file object.
+
+    The file must be opened in binary mode, e.g. ``open(path, "rb")``. GEDCOM 7
+    data streams are always UTF-8, and reading the bytes directly avoids the
+    encoding guesswork and newline translation that text mode would apply.
+
+    The file is read and decoded in chunks, so neither its bytes nor its text are
+    ever held in memory whole; only the structures built from them are.
+
+    Errors are those of :func:`loads`, raised in the same order, that of the
+    lines they are on, however the file divides into chunks.
+    ``include_records``, ``exclude_records``, ``intern`` and ``dataset`` are
+    those of :func:`loads`.
+    """
+    return _collect(
+        iterparse(
+            fp,
+            include_records=include_records,
+            exclude_records=exclude_records,
+            intern=intern,
+        ),
+        dataset,
+    )
+
+
+def _records_at(
+    path: str | os.PathLike[str],
+    mmap: bool,
+    keep: _Keep | None,
+    intern: bool,
+) -> Iterator[GedcomStructure]:
+    with open(path, "rb") as fp:
+        decompressed = compression.reader(fp, path)
+        if decompressed is not None:
+            with decompressed:
+                yield from _parse(_decode(decompressed), keep, intern)
+                return
+        # An empty file cannot be mapped, and there is nothing in it to share.
+        if not mmap or os.fstat(fp.fileno()).st_size == 0:
+            yield from _parse(_decode(fp), keep, intern)
+            return
+        with _mmap.mmap(fp.fileno(), 0, access=_mmap.ACCESS_READ) as mapped:
+            yield from _parse(_decode(mapped), keep, intern)
+
+
+@overload
+def load_path(
+    path: str | os.PathLike[str],
+    *,
+    mmap: bool = ...,
+    include_records: Collection[str] | None = ...,
+    exclude_records: Collection[str] | None = ...,
+    intern: bool = ...,
+    dataset: Literal[False] = ...,
+    cache_dir: str | os.PathLike[str] | None = ...,
+    cache_size: int = ...,
+) -> list[GedcomStructure]: ...
+
+
+@overload
+def load_path(
+    path: str | os.PathLike[str],
+    *,
+    mmap: bool = ...,
+    include_records: Collection[str] | None = ...,
+    exclude_records: Collection[str] | None = ...,
+    intern: bool = ...,
+    dataset: Literal[True],
+    cache_dir: str | os.PathLike[str] | None = ...,
+    cache_size: int = ...,
+) -> Dataset: ...
+
+
+def load_path(
+    path: str | os.PathLike[str],
+    *,
+    mmap: bool = False,
+    include_records: Collection[str] | None = None,
+    exclude_records: Collection[str] | None = None,
+    intern: bool = False,
+    dataset: bool = False,
+    cache_dir: str | os.PathLike[str] | None = None,
+    cache_size: int = cache.DEFAULT_SIZE,
+) -> list[GedcomStructure] | Dataset:
+    """Load a GEDCOM 7 dataset from the file at a path.
+
+    With ``mmap=True`` the file is memory-mapped rather than read, and decoded a
+    chunk at a time straight from the mapped pages. Nothing is copied into the
+    process but the chunk being decoded, and processes mapping the same file
+    share its pages in the operating system's cache.
+
+    A file compressed with gzip, bzip2 or xz is decompressed as it is read, a
+    chunk at a time; see :mod:`gedcom7.compression`. It cannot be mapped, so
+    ``mmap`` is then ignored.
+
+    Given a ``cache_dir``, the records parsed are kept there, and loaded from
+    there, unparsed, while the file is unchanged; see :mod:`gedcom7.cache`. The
+    entries used least recently are removed to keep the cache within
+    ``cache_size`` bytes. Records loaded from the cache share each distinct
+    string, as if loaded with ``intern=True``.
+
+    ``include_records``, ``exclude_records``, ``intern`` and ``dataset`` are
+    those of :func:`loads`.
+    """
+    keep = _keeper(include_records, exclude_records)
+    if cache_dir is None:
+        return _collect(_records_at(path, mmap, keep, intern), dataset)
+    options = tuple(
+        None if tags is None else sorted(tags)
+        for tags in (include_records, exclude_records)
+    )
+    records = cache.load(
+        path,
+        cache_dir,
+        cache_size,
+        options,
+        lambda: list(_records_at(path, mmap, keep, intern)),
+    )
+    return _collect(records, dataset)
+
+
+@overload
+def loads(
+    string: str,
+    *,
+    include_records: Collection[str] | None = ...,
+    exclude_records: Collection[str] | None = ...,
+    intern: bool = ...,
+    dataset: Literal[False] = ...,
+) -> list[GedcomStructure]: ...
+
+
+@overload
+def loads(
+    string: str,
+    *,
+    include_records: Collection[str] | None = ...,
+    exclude_records: Collection[str] | None = ...,
+    intern: bool = ...,
+    dataset: Literal[True],
+) -> Dataset: ...
+
+
+def loads(
+    string: str,
+    *,
+    include_records: Collection[str] | None = None,
+    exclude_records: Collection[str] | None = None,
+    intern: bool = False,
+    dataset: bool = False,
+) -> list[GedcomStructure] | Dataset:
+    """Load a GEDCOM 7 dataset from a string.
+
+    Raises :class:`~gedcom7.exceptions.GedcomParseError` if the data stream does
+    not conform to the specification. Non-conforming lines are never skipped.
+    Of the errors in single lines, a banned character among them, the one on the
+    first such line is raised; then those found only at the end of the stream.
+
+    To load only some records, give the tags of the records wanted as
+    ``include_records``, or those of the records not wanted as
+    ``exclude_records``::
+
+        gedcom7.loads(string, include_records={"INDI", "FAM"})
+
+    An extension tag the header schema documents may be given either as written
+    or as the URI it stands for.
+
+    The lines of a record left out are passed over without being parsed, up to
+    the next level 0 line, so they are not checked either, but for banned
+    characters, nor are pointers from them. The cross-reference identifiers of
+    the records left out still count: pointers to them do not dangle. The HEAD
+    and TRLR pseudo-structures are always loaded.
+
+    Tags, cross-reference identifiers and pointers are interned, so that each is
+    held once in memory however many structures have it. With ``intern=True``
+    the payloads are shared too: a short payload equal to one seen lately is
+    given the same string, as place names, dates and the like often are. This
+    costs a little time, and saves memory in proportion to how much the payloads
+    repeat.
+
+    With ``dataset=True`` the records are returned as a
+    :class:`~gedcom7.dataset.Dataset`, which indexes them by cross-reference
+    identifier and by tag, and through which pointers can be followed.
+    """
+    return _collect(
+        _parse([string], _keeper(include_records, exclude_records), intern), dataset
+    )
+
+
+def iterparse(
+    fp: BinaryIO,
+    *,
+    include_records: Collection[str] | None = None,
+    exclude_records: Collection[str] | None = None,
+    intern: bool = False,
+) -> Iterator[GedcomStructure]:
+    """Parse a binary file object record by record.
+
+    ::
+
+        with open("my.ged", "rb") as f:
+            for record in gedcom7.iterparse(f):
+                ...
+
+    The file is read in chunks and each record is yielded as soon as the next
+    level 0 line shows it to be complete, so only one record need be held in
+    memory at a time, however large the file.
+
+    Errors are those of :func:`loads`, raised as the offending line is reached,
+    a banned character included, so in the order of the lines they are on.
+    Pointers may refer forward, so a pointer matching no cross-reference
+    identifier, and a dataset not opening with HEAD or not closing with TRLR, are
+    only reported once the end of the data stream has been read -- after the
+    records before it have been yielded.
+
+    ``include_records``, ``exclude_records`` and ``intern`` are those of
+    :func:`loads`.
+    """
+    return _parse(_decode(fp), _keeper(include_records, exclude_records), intern)
+
+
+def events(fp: BinaryIO) -> Iterator[Event]:
+    """Parse a binary file object into start and end events, building no trees.
+
+    ::
+
+        with open("my.ged", "rb") as f:
+            for kind, level, xref, tag, pointer, text in gedcom7.events(f):
+                if kind == "start" and tag == "NAME":
+                    ...
+
+    Each structure is reported by a start :class:`~gedcom7.types.Event` once its
+    payload is complete, and by an end event once its last substructure has
+    ended, so the events nest as the structures do. The events carry what a
+    :class:`~gedcom7.types.GedcomStructure` would, less the tree: CONT lines are
+    folded into the payload and documented extension tags resolved to URIs.
+
+    The file is read in chunks as by :func:`iterparse`, the same rules are
+    checked, and the same errors raised. The checks that need the whole stream
+    are made at its end, before the end events still outstanding are yielded.
+    """
+    return _events(_split(_decode(fp)))
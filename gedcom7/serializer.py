@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
+import contextlib
+import errno
+import os
 import re
+import shutil
+import tempfile
 from typing import TYPE_CHECKING
 
-from . import const, grammar
+from . import compression, const, grammar
 from .exceptions import GedcomSerializeError, GedcomValidationError
 from .types import GedcomStructure
 from .validator import validate as _validate
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
     from typing import BinaryIO
 
 _EOL = re.compile(r"\r\n|\r|\n")
@@ -23,6 +28,7 @@ _TAGDEF = re.compile(grammar.tagdef)
 _EXTTAG = re.compile(grammar.exttag)
 
 _BOM = "\ufeff"
+_TEMPORARY_SUFFIX = ".tmp"
 
 
 def _escape(linestr: str) -> str:
@@ -199,6 +205,36 @@ def _lines(
         yield from _lines(child, level + 1, uris)
 
 
+def _prepare(
+    records: Iterable[GedcomStructure], line_terminator: str, validate: bool
+) -> list[GedcomStructure]:
+    """Check the options and, if asked, the dataset, before anything is written."""
+    if line_terminator not in ("\n", "\r\n", "\r"):
+        raise GedcomSerializeError(
+            f"{line_terminator!r} is not a valid line terminator; "
+            "use '\\n', '\\r\\n' or '\\r'"
+        )
+    records = list(records)
+    if validate:
+        errors = _validate(records)
+        if errors:
+            raise GedcomValidationError(errors)
+    return records
+
+
+def _chunks(records: list[GedcomStructure], line_terminator: str) -> Iterator[str]:
+    """Yield the data stream record by record."""
+    uris = _schema(records)
+    for record in records:
+        chunk = "".join(line + line_terminator for line in _lines(record, 0, uris))
+        banned = _BANNED.search(chunk)
+        if banned:
+            raise GedcomSerializeError(
+                f"banned character U+{ord(banned.group()):04X} in payload"
+            )
+        yield chunk
+
+
 def dumps(
     records: Iterable[GedcomStructure],
     *,
@@ -225,27 +261,10 @@ def dumps(
     every problem :func:`~gedcom7.validator.validate` found, rather than only the
     first one that stops a line being written.
     """
-    if line_terminator not in ("\n", "\r\n", "\r"):
-        raise GedcomSerializeError(
-            f"{line_terminator!r} is not a valid line terminator; "
-            "use '\\n', '\\r\\n' or '\\r'"
-        )
-
-    records = list(records)
-    if validate:
-        errors = _validate(records)
-        if errors:
-            raise GedcomValidationError(errors)
-    uris = _schema(records)
-    lines = [line for record in records for line in _lines(record, 0, uris)]
-
-    string = "".join(line + line_terminator for line in lines)
-    banned = _BANNED.search(string)
-    if banned:
-        raise GedcomSerializeError(
-            f"banned character U+{ord(banned.group()):04X} in payload"
-        )
-    return (_BOM if byte_order_mark else "") + string
+    records = _prepare(records, line_terminator, validate)
+    return (_BOM if byte_order_mark else "") + "".join(
+        _chunks(records, line_terminator)
+    )
 
 
 def dump(
@@ -272,3 +291,66 @@ def dump(
         raise TypeError(
             'File must be opened in binary mode, e.g. use `open("my.ged", "wb")`'
         ) from None
+
+
+def _copy_mode(target: str, temporary: str) -> None:
+    """Give the temporary file the mode the file it replaces would have."""
+    try:
+        shutil.copymode(target, temporary)
+    except FileNotFoundError:
+        # a new file, made as open would make it: readable and writable by all
+        # the umask allows, rather than by the owner alone as mkstemp makes it
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temporary, 0o666 & ~umask)
+
+
+def dump_path(
+    records: Iterable[GedcomStructure],
+    path: str | os.PathLike[str],
+    *,
+    line_terminator: str = "\n",
+    byte_order_mark: bool = True,
+    validate: bool = False,
+) -> None:
+    """Serialize structures to the file at a path.
+
+    The data stream is encoded and written a record at a time, so it is never
+    held in memory whole. A path ending in ``.gz``, ``.bz2``, ``.xz`` or
+    ``.lzma`` is written compressed accordingly, as the data is produced; see
+    :mod:`gedcom7.compression`.
+
+    The options and errors are those of :func:`dumps`. The data is written to a
+    temporary file in the same directory, which is moved into place once whole,
+    so should an error stop the writing part way, a file already at the path is
+    left as it was.
+    """
+    records = _prepare(records, line_terminator, validate)
+    # a symbolic link is followed, so that the file it points to is replaced
+    # rather than the link
+    target = os.path.realpath(path)
+    # a file already there, which the user may not write over, is refused as
+    # opening it would have been, rather than replaced
+    if os.path.exists(target) and not os.access(target, os.W_OK):
+        raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), target)
+    fd, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(target) or ".", suffix=_TEMPORARY_SUFFIX
+    )
+    try:
+        with open(fd, "wb") as raw:
+            compressed = compression.writer(raw, path)
+            fp = raw if compressed is None else compressed
+            try:
+                if byte_order_mark:
+                    fp.write(_BOM.encode("utf-8"))
+                for chunk in _chunks(records, line_terminator):
+                    fp.write(chunk.encode("utf-8"))
+            finally:
+                if compressed is not None:
+                    compressed.close()
+        _copy_mode(target, temporary)
+        os.replace(temporary, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+        raise
@@ -0,0 +1,247 @@
+"""Load a dataset into columns of numbers rather than a tree of objects.
+
+A :class:`GedcomTable` holds one row per structure, in the order of the lines,
+with each field kept in a column of its own: an :class:`array.array` of numbers,
+or offsets into one string holding every payload. A structure costs a few dozen
+bytes plus its payload, rather than a Python object with a list of children::
+
+    table = gedcom7.table.load_path("huge.ged")
+    date = table.tag_id("DATE")
+    dates = [table.payload(row) for row, tag in enumerate(table.tag_ids)
+             if tag == date]
+
+Trees of :class:`~gedcom7.types.GedcomStructure` are built from the rows only
+when asked for, by :meth:`GedcomTable.structure` and :meth:`GedcomTable.records`.
+"""
+
+from __future__ import annotations
+
+import array
+import os
+from typing import TYPE_CHECKING
+
+from . import compression, const, parser
+from .types import GedcomStructure
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import BinaryIO
+
+# Every standard tag has the same id in every table; other tags are numbered on
+# from these as they are met.
+_STANDARD_TAGS = (
+    const.HEAD,
+    const.TRLR,
+    *sorted({tag for tags in const.substructures.values() for tag in tags}),
+)
+
+
+class GedcomTable:
+    """The structures of a dataset as columns, one row per structure.
+
+    Row ``i`` of the columns describes the ``i``-th structure, counting in the
+    order the lines are in, CONT lines apart; so a structure's substructures are
+    the rows after it, up to the next of its level or less.
+
+    The columns:
+
+    - ``levels``: the level of each structure.
+    - ``parents``: the row of its superstructure, or -1 for a record.
+    - ``tag_ids``: its tag, as an index into ``tags``.
+    - ``xref_ids`` and ``pointer_ids``: its cross-reference identifier and
+      pointer, as indexes into ``ids``, or -1 for none.
+    - ``payload_starts`` and ``payload_lengths``: where its payload is in
+      ``text``, the payloads of every structure run together.
+
+    An identifier has the same index as a cross-reference identifier and as a
+    pointer, so pointers can be matched to records by number.
+    """
+
+    def __init__(self) -> None:
+        """Make an empty table, to be filled by the parser."""
+        self.levels = array.array("H")
+        self.parents = array.array("i")
+        self.tag_ids = array.array("I")
+        self.xref_ids = array.array("i")
+        self.pointer_ids = array.array("i")
+        self.payload_starts = array.array("q")
+        self.payload_lengths = array.array("i")
+        self.text = ""
+        self.tags: list[str] = list(_STANDARD_TAGS)
+        self.ids: list[str] = []
+        self._tag_ids = {tag: i for i, tag in enumerate(self.tags)}
+        self._ids: dict[str, int] = {}
+        # identifier index -> the row of the record it identifies
+        self._records: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self.levels)
+
+    def tag_id(self, tag: str) -> int:
+        """Return the number standing for a tag.
+
+        Every standard tag has a number, fixed whether or not any row has it;
+        another tag has one once a row has it, and -1 stands for it until then.
+        """
+        return self._tag_ids.get(tag, -1)
+
+    def row(self, xref: str) -> int:
+        """Return the row of the record with a cross-reference identifier.
+
+        Raises KeyError if there is none.
+        """
+        index = self._ids.get(xref)
+        if index is None or index not in self._records:
+            raise KeyError(xref)
+        return self._records[index]
+
+    def payload(self, row: int) -> str:
+        """Return the payload of the structure in a row."""
+        start = self.payload_starts[row]
+        return self.text[start : start + self.payload_lengths[row]]
+
+    def structure(self, row: int) -> GedcomStructure:
+        """Build the structure in a row, with all its substructures."""
+        levels = self.levels
+        base = levels[row]
+        root = self._node(row)
+        stack = [root]
+        end = len(levels)
+        row += 1
+        while row < end and levels[row] > base:
+            depth = levels[row] - base
+            del stack[depth:]
+            node = self._node(row)
+            stack[-1].append_child(node)
+            stack.append(node)
+            row += 1
+        return root
+
+    def records(self) -> Iterator[GedcomStructure]:
+        """Build each record in turn, as :func:`gedcom7.iterparse` yields them."""
+        for row, level in enumerate(self.levels):
+            if level == 0:
+                yield self.structure(row)
+
+    def _node(self, row: int) -> GedcomStructure:
+        xref = self.xref_ids[row]
+        pointer = self.pointer_ids[row]
+        return GedcomStructure(
+            tag=self.tags[self.tag_ids[row]],
+            pointer=None if pointer < 0 else self.ids[pointer],
+            text=self.payload(row),
+            xref=None if xref < 0 else self.ids[xref],
+        )
+
+
+class _Row:
+    """A structure whose row is written, while its payload may still grow."""
+
+    __slots__ = ("pointer", "row", "tag", "text")
+
+    def __init__(self, row: int, tag: str, pointer: str | None, text: str) -> None:
+        self.row = row
+        self.tag = tag
+        self.pointer = pointer
+        self.text = text
+
+
+class _Columns(parser._Lines[_Row]):
+    """Fill a table's columns from lines, one row per structure.
+
+    A payload is put in the text once its structure is closed, when no CONT line
+    can add to it any more, so the payloads are not in the order of the rows.
+    """
+
+    def __init__(self, table: GedcomTable) -> None:
+        super().__init__()
+        self.table = table
+        self.parts: list[str] = []
+        self.offset = 0
+
+    def _id(self, identifier: str) -> int:
+        ids = self.table._ids
+        index = ids.get(identifier)
+        if index is None:
+            index = ids[identifier] = len(ids)
+            self.table.ids.append(identifier)
+        return index
+
+    def open(
+        self, level: int, xref: str | None, tag: str, pointer: str | None, text: str
+    ) -> _Row:
+        table = self.table
+        row = len(table.levels)
+        table.levels.append(level)
+        table.parents.append(self.stack[level - 1].row if level else -1)
+        tag_id = table._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = table._tag_ids[tag] = len(table.tags)
+            table.tags.append(tag)
+        table.tag_ids.append(tag_id)
+        if xref is None:
+            table.xref_ids.append(-1)
+        else:
+            index = self._id(xref)
+            table.xref_ids.append(index)
+            table._records[index] = row
+        table.pointer_ids.append(-1 if pointer is None else self._id(pointer))
+        table.payload_starts.append(0)
+        table.payload_lengths.append(0)
+        return _Row(row, tag, pointer, text)
+
+    def close(self, level: int) -> None:
+        table = self.table
+        for closed in self.stack[level:]:
+            text = closed.text
+            if text:
+                table.payload_starts[closed.row] = self.offset
+                table.payload_lengths[closed.row] = len(text)
+                self.parts.append(text)
+                self.offset += len(text)
+
+    def finish(self) -> GedcomTable:
+        """Check what can only be checked at the end, and complete the table."""
+        self.check()
+        self.close(0)
+        self.table.text = "".join(self.parts)
+        self.parts.clear()
+        return self.table
+
+
+def _fill(lines: Iterable[str]) -> GedcomTable:
+    columns = _Columns(GedcomTable())
+    for text in lines:
+        columns.line(text)
+    return columns.finish()
+
+
+def loads(string: str) -> GedcomTable:
+    """Load a GEDCOM 7 dataset from a string into a table.
+
+    The rules checked and the errors raised are those of :func:`gedcom7.loads`.
+    """
+    return _fill(parser._split([string]))
+
+
+def load(fp: BinaryIO) -> GedcomTable:
+    """Load a GEDCOM 7 dataset from a binary file object into a table.
+
+    The file is read and decoded in chunks, as by :func:`gedcom7.load`.
+    """
+    return _fill(parser._split(parser._decode(fp)))
+
+
+def load_path(path: str | os.PathLike[str]) -> GedcomTable:
+    """Load a GEDCOM 7 dataset from the file at a path into a table.
+
+    A compressed file is decompressed as it is read, as by
+    :func:`gedcom7.load_path`.
+    """
+    with open(path, "rb") as fp:
+        decompressed = compression.reader(fp, path)
+        if decompressed is None:
+            return load(fp)
+        with decompressed:
+            return load(decompressed)
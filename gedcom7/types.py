@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Literal
+from typing import TYPE_CHECKING, Literal, NamedTuple
 
 from . import cast, const
 
+if TYPE_CHECKING:
+    from .dataset import Dataset
 
-@dataclass
+
+@dataclass(slots=True)
 class GedcomStructure:
     """Gedcom structure class."""
 
@@ -22,6 +25,8 @@ class GedcomStructure:
     # it would make __eq__ recurse endlessly and __repr__ print every ancestor.
     # A structure's superstructure is implied by its position in the tree.
     parent: GedcomStructure | None = field(default=None, compare=False, repr=False)
+    # the dataset a record belongs to, set by it, and None for any substructure
+    dataset: Dataset | None = field(default=None, init=False, compare=False, repr=False)
 
     @property
     def type_id(self) -> str | None:
@@ -51,9 +56,78 @@ class GedcomStructure:
             child.parent = self
 
     def append_child(self, child: GedcomStructure) -> None:
-        """Append a child to the structure and set the child's parent to self."""
+        """Append a child to the structure and set the child's parent to self.
+
+        The :class:`~gedcom7.dataset.Dataset` the structure may belong to indexes
+        the child's pointers. Changing ``children`` directly goes unseen by it,
+        leaving its backlinks stale.
+        """
         child.parent = self
         self.children.append(child)
+        dataset = self.record.dataset
+        if dataset is not None:
+            dataset._link(child)
+
+    def remove_child(self, child: GedcomStructure) -> None:
+        """Remove a child from the structure, and clear the child's parent.
+
+        The child and its substructures are dropped from the backlinks of the
+        :class:`~gedcom7.dataset.Dataset` the structure may belong to. Raises
+        ValueError if ``child`` is not a child of the structure.
+        """
+        index = next(
+            (i for i, existing in enumerate(self.children) if existing is child), None
+        )
+        if index is None:
+            raise ValueError("the structure is not a child of this one")
+        dataset = self.record.dataset
+        if dataset is not None:
+            dataset._unlink(child)
+        del self.children[index]
+        child.parent = None
+
+    def set_pointer(self, pointer: str | None) -> None:
+        """Set the pointer payload, keeping a dataset's backlinks up to date.
+
+        Assigning ``pointer`` directly goes unseen by the
+        :class:`~gedcom7.dataset.Dataset` the structure may belong to, whose
+        backlinks are then left stale: the structure stays listed under its old
+        pointer, and not under its new one.
+        """
+        dataset = self.record.dataset
+        if dataset is not None:
+            dataset._unlink(self, subtree=False)
+        self.pointer = pointer
+        if dataset is not None:
+            dataset._link(self, subtree=False)
+
+    @property
+    def record(self) -> GedcomStructure:
+        """Get the record the structure is part of: the root of its tree."""
+        record = self
+        while record.parent is not None:
+            record = record.parent
+        return record
+
+    @property
+    def target(self) -> GedcomStructure | None:
+        """Get the record the pointer payload points to.
+
+        Returns None if there is no pointer, if it is ``@VOID@``, or if it points
+        to no record. Pointers are resolved through the
+        :class:`~gedcom7.dataset.Dataset` the structure's record belongs to, so
+        raises ValueError if it belongs to none.
+        """
+        pointer = self.pointer
+        if pointer is None or pointer == const.VOIDPTR:
+            return None
+        record = self.record
+        if record.dataset is None:
+            raise ValueError(
+                f"{pointer} cannot be resolved: the record is in no Dataset; "
+                "load it with dataset=True"
+            )
+        return record.dataset.get(pointer)
 
     @property
     def value(self) -> DataType | None:
@@ -66,7 +140,23 @@ class GedcomStructure:
         return cast.cast_value(text=self.text, type_id=type_id)
 
 
-@dataclass
+class Event(NamedTuple):
+    """A structure starting or ending, as reported by :func:`gedcom7.events`.
+
+    ``tag`` is a URI where the header schema documents an extension tag, as for
+    :class:`GedcomStructure`, and ``text`` the whole payload, CONT lines folded
+    in. An end event repeats its start event's fields.
+    """
+
+    kind: Literal["start", "end"]
+    level: int
+    xref: str | None
+    tag: str
+    pointer: str | None
+    text: str
+
+
+@dataclass(slots=True)
 class PersonalName:
     """Personal name type."""
 
@@ -76,7 +166,7 @@ class PersonalName:
     suffix: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Time:
     """Time type."""
 
@@ -91,7 +181,7 @@ class Time:
     tz: Literal["Z"] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Age:
     """Age type."""
 
@@ -102,14 +192,14 @@ class Age:
     days: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MediaType:
     """Media type type."""
 
     media_type: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TagDefinition:
     """Tag definition type: an extension tag and the URI it abbreviates."""
 
@@ -117,7 +207,7 @@ class TagDefinition:
     uri: str
 
 
-@dataclass
+@dataclass(slots=True)
 class DateExact:
     """Exact date type."""
 
@@ -126,7 +216,7 @@ class DateExact:
     year: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Date:
     """Date type."""
 
@@ -137,7 +227,7 @@ class Date:
     epoch: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DatePeriod:
     """Date period type."""
 
@@ -145,7 +235,7 @@ class DatePeriod:
     to: Date | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DateApprox:
     """Date approx type."""
 
@@ -153,7 +243,7 @@ class DateApprox:
     approx: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DateRange:
     """Date range type."""
 
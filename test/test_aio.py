@@ -0,0 +1,92 @@
+import asyncio
+import pathlib
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import gedcom7
+import gedcom7.aio
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+
+def reader(data: bytes) -> asyncio.StreamReader:
+    stream = asyncio.StreamReader()
+    stream.feed_data(data)
+    stream.feed_eof()
+    return stream
+
+
+async def pieces(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def test_aload_from_a_stream_reader() -> None:
+    expected = gedcom7.loads(MAXIMAL.read_text(encoding="utf-8"))
+
+    async def main() -> list[gedcom7.types.GedcomStructure]:
+        return await gedcom7.aio.aload(reader(MAXIMAL.read_bytes()))
+
+    assert asyncio.run(main()) == expected
+
+
+@pytest.mark.parametrize("size", [5, 1 << 20])
+def test_aiterparse_from_an_async_iterator(size: int) -> None:
+    expected = gedcom7.loads(MAXIMAL.read_text(encoding="utf-8"))
+
+    async def main() -> list[gedcom7.types.GedcomStructure]:
+        source = pieces(MAXIMAL.read_bytes(), size)
+        return [record async for record in gedcom7.aio.aiterparse(source)]
+
+    assert asyncio.run(main()) == expected
+
+
+def test_aload_in_a_thread_pool() -> None:
+    expected = gedcom7.loads(MAXIMAL.read_text(encoding="utf-8"))
+
+    async def main() -> list[gedcom7.types.GedcomStructure]:
+        with ThreadPoolExecutor(1) as executor:
+            source = reader(MAXIMAL.read_bytes())
+            return await gedcom7.aio.aload(source, executor=executor)
+
+    assert asyncio.run(main()) == expected
+
+
+def test_aload_refuses_a_process_pool() -> None:
+    async def main() -> None:
+        with ProcessPoolExecutor(1) as executor:
+            await gedcom7.aio.aload(reader(b""), executor=executor)
+
+    with pytest.raises(TypeError, match="threads"):
+        asyncio.run(main())
+
+
+def test_event_loop_runs_while_parsing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Other tasks get a turn between the pieces of a single large read."""
+    monkeypatch.setattr(gedcom7.aio, "_CHUNK_SIZE", 256)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        task = asyncio.create_task(ticker())
+        await gedcom7.aio.aload(pieces(MAXIMAL.read_bytes(), 1 << 20))
+        task.cancel()
+
+    asyncio.run(main())
+    assert ticks > 10
+
+
+def test_errors_carry_line_numbers() -> None:
+    async def main() -> None:
+        await gedcom7.aio.aload(reader(b"0 HEAD\n1 GEDC\n2 vers 7.0\n0 TRLR\n"))
+
+    with pytest.raises(gedcom7.GedcomParseError) as excinfo:
+        asyncio.run(main())
+    assert excinfo.value.line_number == 3
@@ -0,0 +1,122 @@
+import gc
+import io
+import pathlib
+from collections.abc import Callable
+
+import pytest
+
+import gedcom7
+import gedcom7.binary
+from gedcom7.types import GedcomStructure
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+
+def test_round_trip() -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    data = gedcom7.binary.dumps(records)
+    assert data.startswith(b"GEDCOM7\x00")
+    assert len(data) < MAXIMAL.stat().st_size
+    loaded = gedcom7.binary.loads(data)
+    assert loaded == records
+    assert gedcom7.dumps(loaded) == gedcom7.dumps(records)
+
+
+def test_file_objects() -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    fp = io.BytesIO()
+    gedcom7.binary.dump(records, fp)
+    fp.seek(0)
+    assert gedcom7.binary.load(fp) == records
+
+
+def test_anything_round_trips() -> None:
+    records = [
+        GedcomStructure(
+            tag="_X",
+            xref="@X1@",
+            text="ünïcödé\nline two\U0001f600",
+            children=[
+                GedcomStructure(tag="A", pointer="", text=""),
+                GedcomStructure(
+                    tag="https://example.com/b",
+                    pointer="@X1@",
+                    children=[GedcomStructure(tag="C", text="@@ not escaped")],
+                ),
+                GedcomStructure(tag="A", text="\x00"),
+            ],
+        ),
+        GedcomStructure(tag="_X"),
+    ]
+    loaded = gedcom7.binary.loads(gedcom7.binary.dumps(records))
+    assert loaded == records
+    assert loaded[0].children[0].pointer == ""
+    assert loaded[0].children[2].pointer is None
+    assert gedcom7.binary.loads(gedcom7.binary.dumps([])) == []
+
+
+def test_structures_are_whole() -> None:
+    records = gedcom7.binary.loads(
+        gedcom7.binary.dumps(gedcom7.load_path(MAXIMAL, dataset=True))
+    )
+    for record in records:
+        assert record.parent is None
+        assert record.dataset is None
+        for child in record.children:
+            assert child.parent is record
+            assert child.dataset is None
+    assert gedcom7.Dataset(records)["@I1@"].xref == "@I1@"
+
+
+def test_wide_columns() -> None:
+    # more strings than fit in two bytes, and levels beyond one byte
+    deep = GedcomStructure(tag="_D")
+    node = deep
+    for _ in range(300):
+        child = GedcomStructure(tag="_D")
+        node.append_child(child)
+        node = child
+    records = [GedcomStructure(tag="_T", text=str(i)) for i in range(70000)]
+    loaded = gedcom7.binary.loads(gedcom7.binary.dumps([*records, deep]))
+    assert loaded[:-1] == records
+    depth, node = 0, loaded[-1]
+    while node.children:
+        assert len(node.children) == 1
+        depth, node = depth + 1, node.children[0]
+    assert depth == 300
+
+
+def test_collector_left_as_it_was() -> None:
+    data = gedcom7.binary.dumps(gedcom7.load_path(MAXIMAL))
+    assert gc.isenabled()
+    gedcom7.binary.loads(data)
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        gedcom7.binary.loads(data)
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+@pytest.mark.parametrize(
+    ("change", "message"),
+    [
+        (lambda data: b"not binary data at all" + data, "not binary GEDCOM data"),
+        (lambda data: data[:8] + b"\x02" + data[9:], "version 2"),
+        (lambda data: data[:-1], "the strings are not all there"),
+        (lambda data: data[:40], "ends too soon"),
+    ],
+)
+def test_bad_data(change: Callable[[bytes], bytes], message: str) -> None:
+    data = gedcom7.binary.dumps(gedcom7.load_path(MAXIMAL))
+    with pytest.raises(gedcom7.GedcomError, match=message):
+        gedcom7.binary.loads(change(data))
+
+
+def test_structure_out_of_place() -> None:
+    data = bytearray(gedcom7.binary.dumps([GedcomStructure(tag="A")]))
+    # the one structure's level, after the header and the string lengths
+    data[33 + 1 + 2 + 1] = 1
+    with pytest.raises(gedcom7.GedcomError, match="out of place"):
+        gedcom7.binary.loads(bytes(data))
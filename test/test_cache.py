@@ -0,0 +1,148 @@
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import gedcom7
+import gedcom7.cache
+from gedcom7 import parser
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+GEDCOM = "0 HEAD\n1 GEDC\n2 VERS 7.0\n0 @I1@ INDI\n1 NAME {name}\n0 TRLR\n"
+
+
+def write(tmp_path: pathlib.Path, name: str = "John") -> pathlib.Path:
+    path = tmp_path / "data.ged"
+    path.write_text(GEDCOM.format(name=name), encoding="utf-8")
+    return path
+
+
+def entries(cache_dir: pathlib.Path) -> list[pathlib.Path]:
+    return sorted(cache_dir.glob("*.g7c"))
+
+
+def test_hit(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache_dir = tmp_path / "cache"
+    expected = gedcom7.load_path(MAXIMAL)
+    assert gedcom7.load_path(MAXIMAL, cache_dir=cache_dir) == expected
+    assert len(entries(cache_dir)) == 1
+    monkeypatch.setattr(parser, "_records_at", None)
+    assert gedcom7.load_path(MAXIMAL, cache_dir=cache_dir) == expected
+    dataset = gedcom7.load_path(MAXIMAL, cache_dir=cache_dir, dataset=True)
+    assert isinstance(dataset, gedcom7.Dataset)
+    assert dataset == expected
+
+
+def test_options_have_entries_of_their_own(tmp_path: pathlib.Path) -> None:
+    cache_dir = tmp_path / "cache"
+    gedcom7.load_path(MAXIMAL, cache_dir=cache_dir)
+    indis = gedcom7.load_path(MAXIMAL, cache_dir=cache_dir, include_records={"INDI"})
+    assert {record.tag for record in indis} == {"HEAD", "INDI", "TRLR"}
+    again = gedcom7.load_path(MAXIMAL, cache_dir=cache_dir, include_records=["INDI"])
+    assert again == indis
+    assert len(entries(cache_dir)) == 2
+
+
+def test_changed_file_is_parsed_again(tmp_path: pathlib.Path) -> None:
+    cache_dir = tmp_path / "cache"
+    path = write(tmp_path, "John")
+    gedcom7.load_path(path, cache_dir=cache_dir)
+    stat = path.stat()
+    # the same size, but a later modification time
+    write(tmp_path, "Jane")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    records = gedcom7.load_path(path, cache_dir=cache_dir)
+    assert records[1].children[0].text == "Jane"
+    assert len(entries(cache_dir)) == 1
+
+
+def test_touched_file_is_not_parsed_again(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_dir = tmp_path / "cache"
+    path = write(tmp_path)
+    gedcom7.load_path(path, cache_dir=cache_dir)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    monkeypatch.setattr(parser, "_records_at", None)
+    assert gedcom7.load_path(path, cache_dir=cache_dir)[1].children[0].text == "John"
+
+
+def test_corrupt_entry_is_replaced(tmp_path: pathlib.Path) -> None:
+    cache_dir = tmp_path / "cache"
+    path = write(tmp_path)
+    gedcom7.load_path(path, cache_dir=cache_dir)
+    (entry,) = entries(cache_dir)
+    entry.write_bytes(entry.read_bytes()[:-3])
+    assert gedcom7.load_path(path, cache_dir=cache_dir) == gedcom7.load_path(path)
+    assert gedcom7.cache._read(os.fspath(entry), path, path.stat()) is not None
+
+
+def test_unwritable_cache_is_done_without(tmp_path: pathlib.Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    path = write(tmp_path)
+    assert gedcom7.load_path(path, cache_dir=blocker / "cache") == gedcom7.load_path(
+        path
+    )
+
+
+def test_parse_errors_are_not_cached(tmp_path: pathlib.Path) -> None:
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "bad.ged"
+    path.write_text("0 HEAD\n2 VERS 7.0\n0 TRLR\n", encoding="utf-8")
+    with pytest.raises(gedcom7.GedcomParseError):
+        gedcom7.load_path(path, cache_dir=cache_dir)
+    assert not cache_dir.exists() or not entries(cache_dir)
+
+
+def test_eviction(tmp_path: pathlib.Path) -> None:
+    cache_dir = tmp_path / "cache"
+    paths = []
+    for i in range(3):
+        directory = tmp_path / str(i)
+        directory.mkdir()
+        paths.append(write(directory))
+    gedcom7.load_path(paths[0], cache_dir=cache_dir)
+    (first,) = entries(cache_dir)
+    size = first.stat().st_size
+    os.utime(first, (1, 1))
+    gedcom7.load_path(paths[1], cache_dir=cache_dir)
+    (second,) = set(entries(cache_dir)) - {first}
+    os.utime(second, (2, 2))
+    # using the first makes the second the one used least recently
+    gedcom7.load_path(paths[0], cache_dir=cache_dir)
+    gedcom7.load_path(paths[2], cache_dir=cache_dir, cache_size=2 * size)
+    remaining = entries(cache_dir)
+    assert len(remaining) == 2
+    assert first in remaining
+    assert second not in remaining
+
+
+def test_stale_temporary_files_are_removed(tmp_path: pathlib.Path) -> None:
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    stale, fresh = cache_dir / "a.tmp", cache_dir / "b.tmp"
+    stale.write_bytes(b"")
+    fresh.write_bytes(b"")
+    os.utime(stale, (0, 0))
+    gedcom7.load_path(write(tmp_path), cache_dir=cache_dir)
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def _load(path: pathlib.Path, cache_dir: pathlib.Path) -> int:
+    return len(gedcom7.load_path(path, cache_dir=cache_dir))
+
+
+def test_processes_share_a_cache(tmp_path: pathlib.Path) -> None:
+    cache_dir = tmp_path / "cache"
+    expected = len(gedcom7.load_path(MAXIMAL))
+    with ProcessPoolExecutor(4) as executor:
+        counts = list(executor.map(_load, [MAXIMAL] * 8, [cache_dir] * 8))
+    assert counts == [expected] * 8
+    assert len(entries(cache_dir)) == 1
+    assert not list(cache_dir.glob("*.tmp"))
+    assert gedcom7.load_path(MAXIMAL, cache_dir=cache_dir) == gedcom7.load_path(MAXIMAL)
@@ -0,0 +1,147 @@
+import bz2
+import gzip
+import lzma
+import os
+import pathlib
+import stat
+import subprocess
+import sys
+import tempfile
+from typing import NoReturn
+
+import pytest
+
+import gedcom7
+import gedcom7.parser
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+COMPRESSORS = {
+    ".gz": gzip.decompress,
+    ".bz2": bz2.decompress,
+    ".xz": lzma.decompress,
+    ".lzma": lzma.decompress,
+}
+
+
+@pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+def test_dump_path_compresses_by_extension(suffix: str, tmp_path: pathlib.Path) -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    path = tmp_path / f"out.ged{suffix}"
+    gedcom7.dump_path(records, path)
+    data = COMPRESSORS[suffix](path.read_bytes())
+    assert data == gedcom7.dumps(records).encode("utf-8")
+
+
+@pytest.mark.parametrize("suffix", sorted(COMPRESSORS))
+def test_load_path_round_trips_compressed_files(
+    monkeypatch: pytest.MonkeyPatch, suffix: str, tmp_path: pathlib.Path
+) -> None:
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", 100)
+    records = gedcom7.load_path(MAXIMAL)
+    path = tmp_path / f"out.ged{suffix}"
+    gedcom7.dump_path(records, path)
+    assert gedcom7.load_path(path) == records
+    assert gedcom7.load_path(path, mmap=True) == records
+    assert gedcom7.load_path(path, include_records={"FAM"}) == [
+        record for record in records if record.tag in ("HEAD", "FAM", "TRLR")
+    ]
+
+
+def test_package_imports_without_the_codecs(tmp_path: pathlib.Path) -> None:
+    """A Python built without lzma or bz2 imports gedcom7 and reads plain files."""
+    script = (
+        "import sys\n"
+        "sys.modules['_lzma'] = sys.modules['_bz2'] = None\n"
+        "import gedcom7\n"
+        f"records = gedcom7.load_path({os.fspath(MAXIMAL)!r})\n"
+        f"gedcom7.dump_path(records, {os.fspath(tmp_path / 'out.ged.gz')!r})\n"
+        "try:\n"
+        f"    gedcom7.dump_path(records, {os.fspath(tmp_path / 'out.ged.xz')!r})\n"
+        "except ImportError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('xz written without lzma')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+    assert gedcom7.load_path(tmp_path / "out.ged.gz") == gedcom7.load_path(MAXIMAL)
+
+
+def test_load_path_goes_by_magic_bytes_not_name(tmp_path: pathlib.Path) -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    compressed = tmp_path / "archive"
+    compressed.write_bytes(bz2.compress(MAXIMAL.read_bytes()))
+    assert gedcom7.load_path(compressed) == records
+    plain = tmp_path / "plain.ged.gz"
+    plain.write_bytes(MAXIMAL.read_bytes())
+    assert gedcom7.load_path(plain) == records
+
+
+def test_dump_path_writes_plain_files(tmp_path: pathlib.Path) -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    path = tmp_path / "out.ged"
+    gedcom7.dump_path(records, path, line_terminator="\r\n", byte_order_mark=False)
+    expected = gedcom7.dumps(records, line_terminator="\r\n", byte_order_mark=False)
+    assert path.read_bytes() == expected.encode("utf-8")
+
+
+def test_dump_path_removes_a_partly_written_file(tmp_path: pathlib.Path) -> None:
+    records = gedcom7.loads("0 HEAD\n1 GEDC\n2 VERS 7.0\n0 @S1@ SNOTE x\n0 TRLR\n")
+    records.insert(2, gedcom7.types.GedcomStructure(tag="SNOTE", text="\x01"))
+    path = tmp_path / "out.ged.gz"
+    with pytest.raises(gedcom7.GedcomSerializeError, match="banned"):
+        gedcom7.dump_path(records, path)
+    assert not path.exists()
+    assert not list(tmp_path.iterdir())
+
+
+def test_failed_dump_path_leaves_the_old_file(tmp_path: pathlib.Path) -> None:
+    records = gedcom7.loads("0 HEAD\n1 GEDC\n2 VERS 7.0\n0 @S1@ SNOTE x\n0 TRLR\n")
+    records.insert(2, gedcom7.types.GedcomStructure(tag="SNOTE", text="\x01"))
+    path = tmp_path / "out.ged"
+    path.write_bytes(b"old")
+    with pytest.raises(gedcom7.GedcomSerializeError, match="banned"):
+        gedcom7.dump_path(records, path)
+    assert path.read_bytes() == b"old"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_dump_path_that_cannot_open_leaves_the_old_file(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "out.ged"
+    path.write_bytes(b"old")
+
+    def refuse(*args: object, **kwargs: object) -> NoReturn:
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(tempfile, "mkstemp", refuse)
+    with pytest.raises(PermissionError):
+        gedcom7.dump_path(gedcom7.load_path(MAXIMAL), path)
+    assert path.read_bytes() == b"old"
+
+
+def test_dump_path_writes_through_a_symbolic_link(tmp_path: pathlib.Path) -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    real = tmp_path / "real.ged"
+    real.write_bytes(b"old")
+    link = tmp_path / "link.ged"
+    link.symlink_to(real)
+    gedcom7.dump_path(records, link)
+    assert link.is_symlink()
+    assert real.read_bytes() == gedcom7.dumps(records).encode("utf-8")
+    assert sorted(tmp_path.iterdir()) == [link, real]
+
+
+def test_dump_path_keeps_the_mode(tmp_path: pathlib.Path) -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    path = tmp_path / "out.ged"
+    path.write_bytes(b"old")
+    path.chmod(0o640)
+    gedcom7.dump_path(records, path)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    new = tmp_path / "new.ged"
+    gedcom7.dump_path(records, new)
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(new.stat().st_mode) == 0o666 & ~umask
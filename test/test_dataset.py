@@ -0,0 +1,226 @@
+import pathlib
+
+import pytest
+
+import gedcom7
+from gedcom7.types import GedcomStructure
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+GEDCOM = """0 HEAD
+1 GEDC
+2 VERS 7.0
+0 @I1@ INDI
+1 FAMS @F1@
+0 @I2@ INDI
+1 FAMC @F1@
+1 ALIA @VOID@
+0 @F1@ FAM
+1 HUSB @I1@
+1 CHIL @I2@
+0 TRLR
+"""
+
+
+def test_dataset_is_opt_in() -> None:
+    records = gedcom7.loads(GEDCOM)
+    assert type(records) is list
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    assert isinstance(dataset, gedcom7.Dataset)
+    assert dataset == records
+    with pytest.raises(ValueError, match="dataset=True"):
+        records[1].children[0].target  # noqa: B018
+    path_dataset = gedcom7.load_path(MAXIMAL, dataset=True)
+    assert path_dataset == gedcom7.load_path(MAXIMAL)
+
+
+def test_lookup_by_xref_and_tag() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    assert dataset["@I2@"] is dataset[2]
+    assert dataset.get("@F1@") is dataset[3]
+    assert dataset.get("@X1@") is None
+    with pytest.raises(KeyError):
+        dataset["@X1@"]
+    assert dataset.by_tag("INDI") == [dataset[1], dataset[2]]
+    assert dataset.by_tag("OBJE") == []
+    assert dataset.head is dataset[0]
+
+
+def test_targets() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    husband, child = dataset["@F1@"].children
+    assert husband.target is dataset["@I1@"]
+    assert child.target is dataset["@I2@"]
+    assert dataset["@I2@"].children[1].target is None
+    assert dataset.head is not None
+    assert dataset.head.target is None
+
+
+def test_indexes_follow_changes() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    family = dataset["@F1@"]
+    obje = GedcomStructure(tag="OBJE", xref="@O1@")
+    dataset.insert(1, obje)
+    indi = GedcomStructure(tag="INDI", xref="@I0@")
+    dataset.insert(1, indi)
+    assert dataset.by_tag("INDI")[0] is indi
+    assert dataset["@O1@"] is obje
+
+    del dataset[dataset.index(family)]
+    assert dataset.get("@F1@") is None
+    assert family.dataset is None
+    assert dataset.by_tag("FAM") == []
+    # the pointer into the removed family no longer resolves
+    assert dataset["@I1@"].children[0].target is None
+
+    dataset[1] = GedcomStructure(tag="INDI", xref="@I9@")
+    assert dataset.get("@I0@") is None
+    assert dataset.by_tag("INDI")[0].xref == "@I9@"
+    dataset[1:3] = [family]
+    assert [record.tag for record in dataset] == ["HEAD", "FAM", "INDI", "INDI", "TRLR"]
+    assert dataset["@F1@"] is family
+    assert dataset.get("@O1@") is None
+    assert dataset.by_tag("INDI") == [dataset[2], dataset[3]]
+
+    dataset.append(GedcomStructure(tag="INDI", xref="@I3@"))
+    assert dataset.by_tag("INDI")[-1].xref == "@I3@"
+    assert dataset.pop().xref == "@I3@"
+    assert [record.xref for record in dataset.by_tag("INDI")] == ["@I1@", "@I2@"]
+
+
+def test_duplicate_xrefs_are_refused() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    with pytest.raises(ValueError, match="duplicate"):
+        dataset.append(GedcomStructure(tag="INDI", xref="@I1@"))
+    with pytest.raises(ValueError, match="duplicate"):
+        dataset[2] = GedcomStructure(tag="INDI", xref="@I1@")
+    assert dataset["@I2@"] is dataset[2]
+    assert gedcom7.loads(GEDCOM) == dataset
+
+
+def test_backlinks_match_a_walk_of_every_structure() -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    index = gedcom7.dataset.backlinks(records)
+    walked: dict[str, list[GedcomStructure]] = {}
+    stack = list(reversed(records))
+    while stack:
+        structure = stack.pop()
+        if structure.pointer and structure.pointer != "@VOID@":
+            walked.setdefault(structure.pointer, []).append(structure)
+        stack.extend(reversed(structure.children))
+    assert index == walked
+    dataset = gedcom7.Dataset(records)
+    for xref, structures in walked.items():
+        assert [id(s) for s in dataset.backlinks(xref)] == [id(s) for s in structures]
+
+
+def test_backlinks_follow_changes() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    indi1, indi2, family = dataset[1:4]
+    assert dataset.backlinks("@I1@") == [family.children[0]]
+    assert dataset.backlinks("@F1@") == [indi1.children[0], indi2.children[0]]
+    assert dataset.backlinks("@VOID@") == []
+
+    indi2.children[0].set_pointer("@F2@")
+    assert dataset.backlinks("@F1@") == [indi1.children[0]]
+    assert dataset.backlinks("@F2@") == [indi2.children[0]]
+
+    wife = GedcomStructure(tag="WIFE", pointer="@I2@")
+    family.append_child(wife)
+    assert [link.record for link in dataset.backlinks("@I2@")] == [family, family]
+
+    del dataset[3]
+    assert dataset.backlinks("@I1@") == []
+    assert dataset.backlinks("@I2@") == []
+    dataset.insert(1, family)
+    assert dataset.backlinks("@I2@") == [family.children[1], wife]
+
+    # a record outside the dataset is not indexed as it changes
+    family.children[0].set_pointer("@I2@")
+    detached = dataset.pop(1)
+    detached.append_child(GedcomStructure(tag="CHIL", pointer="@I1@"))
+    assert dataset.backlinks("@I1@") == []
+
+
+def test_removed_children_leave_the_backlinks() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    indi1, indi2, family = dataset[1:4]
+    famc = indi2.children[0]
+    famc.append_child(GedcomStructure(tag="NOTE", pointer="@I1@"))
+    assert dataset.backlinks("@F1@") == [indi1.children[0], famc]
+    assert len(dataset.backlinks("@I1@")) == 2
+    indi2.remove_child(famc)
+    assert famc.parent is None
+    assert indi2.children == [GedcomStructure(tag="ALIA", pointer="@VOID@")]
+    assert dataset.backlinks("@F1@") == [indi1.children[0]]
+    assert dataset.backlinks("@I1@") == [family.children[0]]
+    with pytest.raises(ValueError, match="not a child"):
+        indi2.remove_child(famc)
+    # a structure in no dataset has no backlinks to keep
+    famc.remove_child(famc.children[0])
+    assert famc.children == []
+
+
+def test_pointer_assigned_directly() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    indi1, indi2, family = dataset[1:4]
+    dataset.backlinks("@F1@")
+    # unseen by the dataset, whose backlinks are left stale
+    indi2.children[0].pointer = "@F2@"
+    assert dataset.backlinks("@F2@") == []
+    del dataset[2]
+    assert dataset[:] == [dataset[0], indi1, family, dataset[3]]
+    assert "@I2@" not in [record.xref for record in dataset]
+    with pytest.raises(KeyError):
+        dataset["@I2@"]
+    dataset.insert(2, indi2)
+    assert dataset["@I2@"] is indi2
+    assert dataset.backlinks("@F2@") == [indi2.children[0]]
+    indi2.children[0].set_pointer("@F1@")
+    assert dataset.backlinks("@F1@")[-1] is indi2.children[0]
+
+
+def test_only_records_are_assigned() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    records = list(dataset)
+    with pytest.raises(TypeError, match="GedcomStructure"):
+        dataset[1] = "0 @I3@ INDI"  # type: ignore[call-overload]
+    with pytest.raises(TypeError, match="iterable"):
+        dataset[1:2] = GedcomStructure(tag="INDI")  # type: ignore[call-overload]
+    assert dataset == records
+    assert dataset["@I1@"] is records[1]
+    with pytest.raises(TypeError, match="unhashable"):
+        hash(dataset)
+
+
+def test_membership() -> None:
+    dataset = gedcom7.loads(GEDCOM, dataset=True)
+    # typed as object: mypy takes a Sequence of records to hold no strings
+    present: object = "@I1@"
+    absent: object = "@X1@"
+    assert present in dataset
+    assert absent not in dataset
+    assert dataset[1] in dataset
+    assert GedcomStructure(tag="INDI") not in dataset
+    assert list(iter(dataset)) == list(gedcom7.loads(GEDCOM))
+    loaded = gedcom7.load_path(MAXIMAL, dataset=True)
+    with gedcom7.open(MAXIMAL) as lazy:
+        xrefs: list[object] = ["@I1@", "@F1@", "@NOPE@"]
+        for xref in xrefs:
+            assert (xref in loaded) == (xref in lazy)
+
+
+def test_a_record_belongs_to_one_dataset() -> None:
+    first = gedcom7.loads(GEDCOM, dataset=True)
+    second = gedcom7.Dataset()
+    record = first[1]
+    with pytest.raises(ValueError, match="another dataset"):
+        second.append(record)
+    with pytest.raises(ValueError, match="another dataset"):
+        gedcom7.Dataset(first)
+    assert len(second) == 0
+    assert record.dataset is first
+    second.append(first.pop(1))
+    assert record.dataset is second
+    assert second["@I1@"] is record
+    assert "@I1@" not in [r.xref for r in first]
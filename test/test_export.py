@@ -0,0 +1,165 @@
+import pathlib
+import sys
+
+import pytest
+
+import gedcom7
+import gedcom7.export
+from gedcom7 import types
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+GEDCOM = """0 HEAD
+1 GEDC
+2 VERS 7.0
+0 @I1@ INDI
+1 NAME John /Doe/
+1 SEX M
+1 BIRT
+2 DATE ABT 1850
+2 PLAC Boston
+3 MAP
+4 LATI N42.36
+4 LONG W71.06
+1 DEAT
+2 DATE 3 MAR 1901
+2 PLAC Boston
+1 OCCU Smith
+2 DATE BET 1870 AND 1880
+0 @I2@ INDI
+1 BIRT
+2 DATE not a date
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @VOID@
+1 CHIL @I2@
+1 MARR
+2 DATE 12 JUN 1875
+2 PLAC Salem
+0 @S1@ SOUR
+1 TITL Parish register
+1 AUTH Rev. Smith
+0 TRLR
+"""
+
+
+def test_lists() -> None:
+    frames = gedcom7.export.to_frames(gedcom7.loads(GEDCOM), backend="lists")
+    assert frames["individuals"] == {
+        "xref": ["@I1@", "@I2@"],
+        "name": ["John /Doe/", None],
+        "sex": ["M", None],
+        "birth_date": [18500000, None],
+        "death_date": [19010303, None],
+    }
+    assert frames["families"] == {
+        "xref": ["@F1@"],
+        "husband": ["@I1@"],
+        "wife": [None],
+        "children": [1],
+        "marriage_date": [18750612],
+    }
+    events = frames["events"]
+    assert events["tag"] == ["BIRT", "DEAT", "OCCU", "BIRT", "MARR"]
+    assert events["record"] == ["@I1@", "@I1@", "@I1@", "@I2@", "@F1@"]
+    assert events["record_tag"] == ["INDI", "INDI", "INDI", "INDI", "FAM"]
+    assert events["date"] == [18500000, 19010303, 18700000, None, 18750612]
+    assert events["date_text"][3] == "not a date"
+    assert events["latitude"] == [42.36, None, None, None, None]
+    assert events["longitude"] == [-71.06, None, None, None, None]
+    assert frames["places"] == {
+        "name": ["Boston", "Salem"],
+        "events": [2, 1],
+        "latitude": [42.36, None],
+        "longitude": [-71.06, None],
+    }
+    assert frames["sources"] == {
+        "xref": ["@S1@"],
+        "title": ["Parish register"],
+        "author": ["Rev. Smith"],
+        "publication": [None],
+        "abbreviation": [None],
+    }
+
+
+def test_date_columns_match_values() -> None:
+    records = gedcom7.load_path(MAXIMAL)
+    events = gedcom7.export.to_frames(records, backend="lists")["events"]
+    expected = []
+    for record in records:
+        kinds = gedcom7.export._EVENTS.get(record.tag, ())
+        for event in record.children:
+            if event.tag in kinds:
+                date = next((c for c in event.children if c.tag == "DATE"), None)
+                value = None if date is None else date.value
+                expected.append(
+                    None if value is None else gedcom7.export.date_key(value)  # type: ignore[arg-type]
+                )
+    assert events["date"] == expected
+    assert any(key is not None for key in expected)
+
+
+@pytest.mark.parametrize(
+    ("value", "key"),
+    [
+        (types.Date(year=1850), 18500000),
+        (types.Date(year=1850, month="JAN"), 18500100),
+        (types.Date(year=1850, month="feb", day=3), 18500203),
+        (types.Date(year=44, month="MAR", day=15, epoch="BCE"), -439685),
+        (types.Date(calendar="HEBREW", year=5600, month="TSH", day=1), 56000000),
+        (types.DateApprox(date=types.Date(year=1900), approx="ABT"), 19000000),
+        (types.DateRange(end=types.Date(year=1900)), 19000000),
+        (types.DatePeriod(to=types.Date(year=1900)), 19000000),
+        (types.DatePeriod(), None),
+    ],
+)
+def test_date_key(value: types.DateValue, key: int | None) -> None:
+    assert gedcom7.export.date_key(value) == key
+
+
+def test_date_keys_sort_as_dates() -> None:
+    texts = ["10 BCE", "1 BCE", "1899", "DEC 1899", "31 DEC 1899", "1 JAN 1900"]
+    keys = [gedcom7.export._date(text) for text in texts]
+    assert None not in keys
+    assert keys == sorted(key or 0 for key in keys)
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="unknown backend"):
+        gedcom7.export.to_frames([], backend="polars")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    ("backend", "module"), [("pandas", "pandas"), ("arrow", "pyarrow")]
+)
+def test_missing_library(
+    monkeypatch: pytest.MonkeyPatch, backend: str, module: str
+) -> None:
+    monkeypatch.setitem(sys.modules, module, None)
+    with pytest.raises(ImportError, match=r"gedcom7\["):
+        gedcom7.export.to_frames([], backend=backend)  # type: ignore[arg-type]
+
+
+def test_pandas() -> None:
+    pytest.importorskip("pandas")
+    frames = gedcom7.export.to_frames(gedcom7.loads(GEDCOM))
+    events = frames["events"]
+    assert str(events["date"].dtype) == "Int64"
+    assert str(events["latitude"].dtype) == "float64"
+    assert events["date"].isna().tolist() == [False, False, False, True, False]
+    assert frames["families"]["children"].tolist() == [1]
+
+
+def test_arrow() -> None:
+    pyarrow = pytest.importorskip("pyarrow")
+    frames = gedcom7.export.to_frames(gedcom7.loads(GEDCOM), backend="arrow")
+    events = frames["events"]
+    assert events.schema.field("date").type == pyarrow.int64()
+    assert events.schema.field("longitude").type == pyarrow.float64()
+    assert events.column("date").to_pylist() == [
+        18500000,
+        19010303,
+        18700000,
+        None,
+        18750612,
+    ]
@@ -0,0 +1,63 @@
+import pathlib
+import zipfile
+
+import pytest
+
+import gedcom7
+import gedcom7.gedzip
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+
+@pytest.fixture
+def package(tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / "family.gdz"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.write(MAXIMAL, gedcom7.gedzip.DATASET)
+        archive.writestr("media/CharlotteBrontë.jpg", b"\xff\xd8jpeg")
+        archive.writestr("media/original.mp3", b"ID3" * 1000)
+    return path
+
+
+def test_load_matches_the_dataset(package: pathlib.Path) -> None:
+    with gedcom7.gedzip.open(package) as gedzip:
+        assert gedzip.load() == gedcom7.load_path(MAXIMAL)
+        records = gedzip.iterparse(include_records={"OBJE"})
+        assert {record.tag for record in records} == {"HEAD", "OBJE", "TRLR"}
+
+
+def test_media_are_found_by_their_url_and_opened_lazily(
+    package: pathlib.Path,
+) -> None:
+    with gedcom7.gedzip.open(package) as gedzip:
+        media = list(gedzip.media(gedzip.iterparse()))
+        assert [file.text for file, _ in media] == [
+            "media/CharlotteBront%C3%AB.jpg",
+            "media/original.mp3",
+        ]
+        photo, sound = (media_file for _, media_file in media)
+        assert photo.name == "media/CharlotteBrontë.jpg"
+        assert sound.size == 3000
+        assert photo.tell() == 0
+        assert photo.read() == b"\xff\xd8jpeg"
+        assert sound.read(3) == b"ID3"
+        sound.seek(-3, 2)
+        assert sound.read() == b"ID3"
+        sound.close()
+        with pytest.raises(ValueError, match="closed"):
+            sound.read()
+
+
+def test_file_rejects_references_outside_the_package(package: pathlib.Path) -> None:
+    with gedcom7.gedzip.open(package) as gedzip:
+        for reference in ("file:///path/to/file1", "http://host/x", "media/x.jpg"):
+            with pytest.raises(KeyError):
+                gedzip.file(reference)
+
+
+def test_a_package_must_hold_a_dataset(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "empty.gdz"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("media/x.jpg", b"")
+    with pytest.raises(gedcom7.GedcomError, match="gedcom.ged"):
+        gedcom7.gedzip.open(path)
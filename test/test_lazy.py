@@ -0,0 +1,149 @@
+import os
+import pathlib
+
+import pytest
+
+import gedcom7
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+HEAD = "0 HEAD\n1 GEDC\n2 VERS 7.0\n1 SCHMA\n2 TAG _FOO http://example.com/foo\n"
+TRLR = "0 TRLR\n"
+
+
+def write(tmp_path: pathlib.Path, text: str) -> pathlib.Path:
+    path = tmp_path / "data.ged"
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+def test_records_match_load() -> None:
+    expected = gedcom7.load_path(MAXIMAL)
+    with gedcom7.open(MAXIMAL) as dataset:
+        assert len(dataset) == len(expected)
+        assert list(dataset) == expected
+        assert dataset.head == expected[0]
+        assert dataset["@I1@"] == next(r for r in expected if r.xref == "@I1@")
+        assert list(dataset.records("FAM")) == [r for r in expected if r.tag == "FAM"]
+        assert "@F1@" in dataset
+        assert "@X9@" not in dataset
+        with pytest.raises(KeyError):
+            dataset["@X9@"]
+
+
+def test_crlf_and_byte_order_mark(tmp_path: pathlib.Path) -> None:
+    text = "\ufeff" + (HEAD + "0 @I1@ INDI\n1 _FOO x\n" + TRLR).replace("\n", "\r\n")
+    with gedcom7.open(write(tmp_path, text)) as dataset:
+        assert list(dataset) == gedcom7.loads(text)
+
+
+def test_extension_records_are_indexed_by_uri(tmp_path: pathlib.Path) -> None:
+    text = HEAD + "0 @X1@ _FOO\n1 NOTE x\n" + TRLR
+    with gedcom7.open(write(tmp_path, text)) as dataset:
+        (record,) = dataset.records("http://example.com/foo")
+        assert record.xref == "@X1@"
+
+
+def test_records_are_cached(tmp_path: pathlib.Path) -> None:
+    text = HEAD + "".join(f"0 @I{i}@ INDI\n" for i in range(5)) + TRLR
+    with gedcom7.open(write(tmp_path, text), cache_size=2) as dataset:
+        first = dataset["@I0@"]
+        assert dataset["@I0@"] is first
+        dataset["@I1@"]
+        dataset["@I2@"]
+        assert dataset["@I0@"] is not first  # evicted, and parsed afresh
+        assert dataset["@I0@"] == first
+
+
+def test_errors_in_a_record_are_raised_when_it_is_parsed(
+    tmp_path: pathlib.Path,
+) -> None:
+    text = HEAD + "0 @I1@ INDI\n1 name x\n0 @I2@ INDI\n" + TRLR
+    with gedcom7.open(write(tmp_path, text)) as dataset:
+        assert dataset["@I2@"].tag == "INDI"
+        with pytest.raises(gedcom7.GedcomParseError, match="malformed") as excinfo:
+            dataset["@I1@"]
+        assert excinfo.value.line_number == 7
+
+
+def test_the_scan_checks_level_0_lines(tmp_path: pathlib.Path) -> None:
+    text = HEAD + "0 @I1@ INDI\n0 @I1@ INDI\n" + TRLR
+    with pytest.raises(gedcom7.GedcomParseError, match="duplicate") as excinfo:
+        gedcom7.open(write(tmp_path, text))
+    assert excinfo.value.line_number == 7
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("", "header and a trailer"),
+        ("\ufeff", "header and a trailer"),
+        (HEAD, "must end with a TRLR"),
+        (HEAD + "0 TRLR\n1 NOTE x\n", "no payload and no substructures"),
+        ("0 @I1@ INDI\n" + TRLR, "must begin with a HEAD"),
+    ],
+)
+def test_the_dataset_must_be_whole(
+    text: str, message: str, tmp_path: pathlib.Path
+) -> None:
+    with pytest.raises(gedcom7.GedcomParseError, match=message):
+        gedcom7.open(write(tmp_path, text))
+
+
+def test_index_is_written_and_reused(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "maximal.ged"
+    path.write_bytes(MAXIMAL.read_bytes())
+    expected = gedcom7.load_path(path)
+    with gedcom7.open(path, index=True) as dataset:
+        assert list(dataset) == expected
+    assert (tmp_path / "maximal.ged.idx").exists()
+
+    def no_scan(self: gedcom7.LazyDataset, digests: bool) -> None:
+        raise AssertionError("scanned despite the index")
+
+    monkeypatch.setattr(gedcom7.LazyDataset, "_scan", no_scan)
+    with gedcom7.open(path, index=True) as dataset:
+        assert list(dataset) == expected
+        assert dataset["@I1@"] == next(r for r in expected if r.xref == "@I1@")
+
+
+def test_stale_index_is_rebuilt(tmp_path: pathlib.Path) -> None:
+    path = write(tmp_path, HEAD + "0 @I1@ INDI\n" + TRLR)
+    gedcom7.open(path, index=True).close()
+    text = HEAD + "0 @I2@ INDI\n1 SEX F\n" + TRLR
+    path.write_bytes(text.encode("utf-8"))
+    with gedcom7.open(path, index=True) as dataset:
+        assert list(dataset) == gedcom7.loads(text)
+
+
+def test_change_the_index_misses_is_caught(tmp_path: pathlib.Path) -> None:
+    """Same size, same modification time: the hash tells the records apart."""
+    path = write(tmp_path, HEAD + "0 @I1@ INDI\n1 SEX M\n" + TRLR)
+    stat = path.stat()
+    gedcom7.open(path, index=True).close()
+    path.write_bytes((HEAD + "0 @I1@ INDI\n1 SEX F\n" + TRLR).encode("utf-8"))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    with (
+        gedcom7.open(path, index=True) as dataset,
+        pytest.raises(gedcom7.GedcomError, match="changed since it was indexed"),
+    ):
+        dataset["@I1@"]
+    with gedcom7.open(path, index=True) as dataset:
+        assert dataset["@I1@"].children[0].text == "F"
+
+
+def test_unreadable_index_is_ignored(tmp_path: pathlib.Path) -> None:
+    path = write(tmp_path, HEAD + "0 @I1@ INDI\n" + TRLR)
+    (tmp_path / "data.ged.idx").write_text("not json")
+    with gedcom7.open(path, index=True) as dataset:
+        assert "@I1@" in dataset
+
+
+def test_star_import_leaves_the_builtin_open() -> None:
+    namespace: dict[str, object] = {}
+    exec("from gedcom7 import *", namespace)
+    assert "open" not in namespace
+    assert "LazyDataset" in namespace
+    assert gedcom7.open is gedcom7.lazy.open
@@ -0,0 +1,167 @@
+import gzip
+import os
+import pathlib
+import zipfile
+
+import pytest
+
+import gedcom7
+import gedcom7.parallel
+from gedcom7.types import GedcomStructure
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+HEAD = "0 HEAD\n1 GEDC\n2 VERS 7.0\n1 SCHMA\n2 TAG _FOO http://example.com/foo\n"
+TRLR = "0 TRLR\n"
+
+
+@pytest.fixture(autouse=True)
+def small_runs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Cut even the small files here into many runs."""
+    monkeypatch.setattr(gedcom7.parallel, "_MIN_RUN", 64)
+
+
+def write(tmp_path: pathlib.Path, text: str) -> pathlib.Path:
+    path = tmp_path / "data.ged"
+    path.write_bytes(text.encode("utf-8"))
+    return path
+
+
+def individuals(count: int) -> str:
+    return "".join(
+        f"0 @I{i}@ INDI\n1 NAME Person /{i}/\n1 _FOO bar\n1 ALIA @I{count - 1 - i}@\n"
+        for i in range(count)
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_parallel_load_matches_loads(workers: int) -> None:
+    expected = gedcom7.loads(MAXIMAL.read_text(encoding="utf-8"))
+    assert gedcom7.parallel.load(MAXIMAL, workers=workers) == expected
+
+
+def test_schema_reaches_every_run(tmp_path: pathlib.Path) -> None:
+    """Extension tags in later runs resolve through the schema read from HEAD."""
+    text = HEAD + individuals(50) + TRLR
+    records = gedcom7.parallel.load(write(tmp_path, text), workers=2)
+    assert records == gedcom7.loads(text)
+    assert records[-2].children[1].tag == "http://example.com/foo"
+
+
+def test_crlf_record_boundaries(tmp_path: pathlib.Path) -> None:
+    text = (HEAD + individuals(50) + TRLR).replace("\n", "\r\n")
+    assert gedcom7.parallel.load(write(tmp_path, text), workers=2) == gedcom7.loads(
+        text
+    )
+
+
+def test_error_line_numbers_count_from_the_start(tmp_path: pathlib.Path) -> None:
+    text = HEAD + individuals(50) + "0 @X@ INDI\n1 name lower\n" + TRLR
+    with pytest.raises(gedcom7.GedcomParseError, match="malformed") as excinfo:
+        gedcom7.parallel.load(write(tmp_path, text), workers=2)
+    assert excinfo.value.line_number == text.count("\n") - 1
+
+
+def test_duplicate_xref_across_runs(tmp_path: pathlib.Path) -> None:
+    text = HEAD + individuals(50) + "0 @I3@ INDI\n" + TRLR
+    with pytest.raises(gedcom7.GedcomParseError, match="duplicate") as excinfo:
+        gedcom7.parallel.load(write(tmp_path, text), workers=2)
+    assert excinfo.value.line_number == text.count("\n") - 1
+
+
+def test_first_error_wins(tmp_path: pathlib.Path) -> None:
+    """A duplicate found across runs is reported before a later error in its run."""
+    text = HEAD + individuals(50) + "0 @I3@ INDI\n1 name lower\n" + TRLR
+    path = write(tmp_path, text)
+    with pytest.raises(gedcom7.GedcomParseError, match="duplicate") as excinfo:
+        gedcom7.parallel.load(path, workers=2)
+    assert excinfo.value.line_number == text.count("\n") - 2
+    with pytest.raises(gedcom7.GedcomParseError) as expected:
+        gedcom7.load_path(path)
+    assert str(excinfo.value) == str(expected.value)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_compressed_file(tmp_path: pathlib.Path, workers: int) -> None:
+    text = HEAD + individuals(50) + TRLR
+    path = tmp_path / "data.ged.gz"
+    path.write_bytes(gzip.compress(text.encode("utf-8")))
+    assert gedcom7.parallel.load(path, workers=workers) == gedcom7.loads(text)
+
+
+def test_dangling_pointer_across_runs(tmp_path: pathlib.Path) -> None:
+    text = HEAD + individuals(50).replace("ALIA @I0@", "ALIA @I99@") + TRLR
+    with pytest.raises(gedcom7.GedcomParseError, match="@I99@") as excinfo:
+        gedcom7.parallel.load(write(tmp_path, text), workers=2)
+    assert excinfo.value.line_number == text.count("\n") - 1
+
+
+def test_missing_trailer(tmp_path: pathlib.Path) -> None:
+    with pytest.raises(gedcom7.GedcomParseError, match="must end with a TRLR"):
+        gedcom7.parallel.load(write(tmp_path, HEAD + individuals(50)), workers=2)
+
+
+def test_workers_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        gedcom7.parallel.load(MAXIMAL, workers=0)
+
+
+def many(tmp_path: pathlib.Path) -> dict[str, list[GedcomStructure] | type[Exception]]:
+    """Write files of every kind load_many reads, and return what each holds."""
+    plain = write(tmp_path, HEAD + individuals(3) + TRLR)
+    packed = tmp_path / "data.ged.gz"
+    packed.write_bytes(gzip.compress(MAXIMAL.read_bytes()))
+    bad = tmp_path / "bad.ged"
+    bad.write_text("0 HEAD\n2 VERS 7.0\n0 TRLR\n", encoding="utf-8")
+    archive = tmp_path / "trees.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.write(MAXIMAL, "a/one.ged")
+        zf.writestr("two.GED", HEAD + individuals(2) + TRLR)
+        zf.writestr("readme.txt", "not a dataset")
+    broken = tmp_path / "broken.zip"
+    broken.write_bytes(b"not a zip archive")
+    return {
+        str(plain): gedcom7.load_path(plain),
+        str(packed): gedcom7.load_path(MAXIMAL),
+        str(bad): gedcom7.GedcomParseError,
+        os.path.join(archive, "a/one.ged"): gedcom7.load_path(MAXIMAL),
+        os.path.join(archive, "two.GED"): gedcom7.loads(HEAD + individuals(2) + TRLR),
+        str(broken): zipfile.BadZipFile,
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_many(tmp_path: pathlib.Path, workers: int) -> None:
+    expected = many(tmp_path)
+    paths = [tmp_path / name for name in sorted(os.listdir(tmp_path))]
+    results = dict(gedcom7.load_many(paths, workers=workers))
+    assert {os.fspath(path) for path in results} == set(expected)
+    for path, result in results.items():
+        wanted = expected[os.fspath(path)]
+        if isinstance(wanted, type):
+            assert isinstance(result, wanted)
+        else:
+            assert result == wanted
+
+
+def test_load_many_keeps_line_numbers(tmp_path: pathlib.Path) -> None:
+    bad = tmp_path / "bad.ged"
+    bad.write_text(
+        "0 HEAD\n1 GEDC\n2 VERS 7.0\n1 NOTE a\n3 X\n0 TRLR\n", encoding="utf-8"
+    )
+    ((path, error),) = gedcom7.load_many([bad], workers=2)
+    assert path == bad
+    assert isinstance(error, gedcom7.GedcomParseError)
+    assert error.line_number == 5
+
+
+def test_load_many_can_stop_early(tmp_path: pathlib.Path) -> None:
+    path = write(tmp_path, HEAD + individuals(3) + TRLR)
+    results = gedcom7.load_many([path] * 50, workers=2)
+    assert next(results)[0] == path
+    results.close()
+
+
+def test_load_many_needs_a_worker() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        list(gedcom7.load_many([MAXIMAL], workers=0))
@@ -1,6 +1,11 @@
+import io
+import itertools
 import pathlib
 
+import pytest
+
 import gedcom7
+import gedcom7.parser
 
 GEDCOM_MIN = """0 HEAD
 1 GEDC
@@ -103,3 +108,353 @@ def test_empty_line_value() -> None:
     assert file_struct.tag == "FILE"
     assert file_struct.text == ""
     assert file_struct.children[0].tag == "FORM"
+
+
+def test_iterparse_matches_loads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Reading in small chunks splits lines, CR-LFs and characters across them."""
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", 7)
+    filename = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+    data = filename.read_bytes()
+    expected = gedcom7.loads(data.decode("utf-8"))
+    for variant in (data, data.replace(b"\n", b"\r\n"), data.replace(b"\n", b"\r")):
+        assert list(gedcom7.iterparse(io.BytesIO(variant))) == expected
+
+
+def test_iterparse_yields_records_before_the_end(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A record is handed over once the next level 0 line has been read."""
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", 16)
+    stream = io.BytesIO(GEDCOM_EXTTAG.encode("utf-8"))
+    records = gedcom7.iterparse(stream)
+    assert next(records).tag == "HEAD"
+    assert stream.tell() < GEDCOM_EXTTAG.index("0 @I2@")
+    assert [record.tag for record in records] == ["INDI", "INDI", "TRLR"]
+
+
+def test_iterparse_reports_dangling_pointers_at_the_end() -> None:
+    """A forward reference can only be known to dangle once the stream is read."""
+    text = GEDCOM_EXTTAG.replace("@I2@ INDI", "@I3@ INDI")
+    records = gedcom7.iterparse(io.BytesIO(text.encode("utf-8")))
+    assert [record.tag for record in itertools.islice(records, 3)] == [
+        "HEAD",
+        "INDI",
+        "INDI",
+    ]
+    with pytest.raises(gedcom7.GedcomParseError, match="pointer @I2@") as excinfo:
+        next(records)
+    assert excinfo.value.line_number == 7
+
+
+def test_iterparse_reports_line_numbers_across_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", 5)
+    text = GEDCOM_MIN.replace("2 VERS 7.0", "2 VERS 7.\x010")
+    with pytest.raises(gedcom7.GedcomParseError, match="banned") as excinfo:
+        list(gedcom7.iterparse(io.BytesIO(text.encode("utf-8"))))
+    assert excinfo.value.line_number == 3
+
+
+@pytest.mark.parametrize(
+    ("text", "message", "line_number"),
+    [
+        ("0 HEAD\n1 GEDC\nbad\n2 VERS 7.\x010\n0 TRLR\n", "malformed", 3),
+        ("0 HEAD\n1 GEDC\n2 VERS 7.\x010\nbad\n0 TRLR\n", "banned", 3),
+        ("0 HEAD\n1 GEDC\n2 VERS 7.0\n0 TRLR\nbad\x01", "banned", 5),
+        ("0 HEAD\n1 GEDC\n2 VERS 7.0\n0 _X\n1 _Y \x01\n0 TRLR\nbad", "banned", 5),
+    ],
+)
+@pytest.mark.parametrize("size", [3, 7, 1 << 16])
+def test_errors_are_reported_in_line_order(
+    monkeypatch: pytest.MonkeyPatch,
+    text: str,
+    message: str,
+    line_number: int,
+    size: int,
+) -> None:
+    """load and loads report the first line with an error, banned or not."""
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", size)
+    for exclude in (None, ["_X"]):
+        with pytest.raises(gedcom7.GedcomParseError, match=message) as excinfo:
+            gedcom7.loads(text, exclude_records=exclude)
+        assert excinfo.value.line_number == line_number
+        stream = io.BytesIO(text.encode("utf-8"))
+        with pytest.raises(gedcom7.GedcomParseError, match=message) as excinfo:
+            gedcom7.load(stream, exclude_records=exclude)
+        assert excinfo.value.line_number == line_number
+
+
+def test_iterparse_requires_binary_mode() -> None:
+    with pytest.raises(TypeError, match="binary mode"):
+        list(gedcom7.iterparse(io.StringIO(GEDCOM_MIN)))  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_load_path(mmap: bool) -> None:
+    source = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+    expected = gedcom7.loads(source.read_text(encoding="utf-8"))
+    assert gedcom7.load_path(source, mmap=mmap) == expected
+    assert gedcom7.load_path(str(source), mmap=mmap) == expected
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_load_path_of_an_empty_file(mmap: bool, tmp_path: pathlib.Path) -> None:
+    """An empty file cannot be mapped, but must fail like any other empty stream."""
+    path = tmp_path / "empty.ged"
+    path.write_bytes(b"")
+    with pytest.raises(gedcom7.GedcomParseError, match="header and a trailer"):
+        gedcom7.load_path(path, mmap=mmap)
+
+
+def test_load_path_mmap_reports_errors(tmp_path: pathlib.Path) -> None:
+    """A parse error must not be masked by the map failing to close."""
+    path = tmp_path / "bad.ged"
+    path.write_bytes(GEDCOM_MIN.replace("1 GEDC", "1 GEDC @X").encode("utf-8"))
+    with pytest.raises(gedcom7.GedcomParseError) as excinfo:
+        gedcom7.load_path(path, mmap=True)
+    assert excinfo.value.line_number == 2
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "0 HEAD",
+        "0 @I1@ INDI",
+        "1 ALIA @I2@",
+        "1 FAMC @VOID@",
+        "1 NOTE @@me",
+        "1 NOTE @@@@@",
+        "1 NOTE a@b",
+        "1 NOTE  two leading spaces",
+        "1 _FOO bar",
+        "1 NOTE ünïcödé",
+        "10 CONT",
+        "1 NOTE ",
+        "1 NOTE @I1@ and more",
+        "1 NOTE @",
+        "1 _",
+        "0 @i1@ INDI",
+        "0 @I1@",
+        "01 NAME x",
+        "١ NAME x",
+        "1 NAMÉ x",
+    ],
+)
+def test_lex_agrees_with_the_line_grammar(line: str) -> None:
+    """The fast path must decide every line exactly as the full grammar would."""
+    match = gedcom7.parser._LINE.fullmatch(line + "\n")
+    expected = (
+        None
+        if match is None
+        else (
+            int(match.group("level")),
+            match.group("xref"),
+            match.group("tag"),
+            match.group("pointer"),
+            match.group("linestr"),
+        )
+    )
+    assert gedcom7.parser._lex(line) == expected
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_incremental_parser_matches_loads(size: int) -> None:
+    """Pieces split lines, CR-LFs and multi-byte characters at every point."""
+    filename = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+    data = filename.read_bytes().replace(b"\n", b"\r\n")
+    parser = gedcom7.IncrementalParser()
+    records: list[gedcom7.types.GedcomStructure] = []
+    for start in range(0, len(data), size):
+        parser.feed(data[start : start + size])
+        records.extend(parser.read_records())
+    parser.close()
+    records.extend(parser.read_records())
+    assert records == gedcom7.loads(data.decode("utf-8"))
+
+
+def test_incremental_parser_hands_over_records_as_completed() -> None:
+    parser = gedcom7.IncrementalParser()
+    parser.feed(b"0 HEAD\n1 GEDC\n2 VERS 7.0\n0 @I1@ IN")
+    assert list(parser.read_records()) == []  # "0 @I1@ IN" may yet continue
+    parser.feed(b"DI\n1 NOTE first\n2 CO")
+    assert [record.tag for record in parser.read_records()] == ["HEAD"]
+    assert list(parser.read_records()) == []
+    parser.feed(b"NT second\n0 TRLR\n")
+    (indi,) = parser.read_records()
+    assert indi.children[0].text == "first\nsecond"
+    parser.close()
+    assert [record.tag for record in parser.read_records()] == ["TRLR"]
+
+
+def test_incremental_parser_rejects_a_bad_line_at_once() -> None:
+    parser = gedcom7.IncrementalParser()
+    parser.feed(b"0 HEAD\n1 GEDC\n")
+    with pytest.raises(gedcom7.GedcomParseError, match="malformed") as excinfo:
+        parser.feed(b"2 vers 7.0\n0 TRLR\n")
+    assert excinfo.value.line_number == 3
+    with pytest.raises(ValueError, match="after close"):
+        parser.feed(b"")
+
+
+def test_incremental_parser_checks_the_end_on_close() -> None:
+    parser = gedcom7.IncrementalParser()
+    parser.feed(GEDCOM_MIN.replace("0 TRLR\n", "").encode("utf-8"))
+    with pytest.raises(gedcom7.GedcomParseError, match="must end with a TRLR"):
+        parser.close()
+
+
+def _tree_events(
+    structure: gedcom7.types.GedcomStructure, level: int = 0
+) -> list[gedcom7.types.Event]:
+    fields = (level, structure.xref, structure.tag, structure.pointer, structure.text)
+    events = [gedcom7.types.Event("start", *fields)]
+    for child in structure.children:
+        events.extend(_tree_events(child, level + 1))
+    events.append(gedcom7.types.Event("end", *fields))
+    return events
+
+
+def test_events_mirror_the_tree(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", 100)
+    filename = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+    expected = [
+        event
+        for record in gedcom7.load_path(filename)
+        for event in _tree_events(record)
+    ]
+    with open(filename, "rb") as f:
+        assert list(gedcom7.events(f)) == expected
+
+
+def test_events_fold_cont_and_resolve_extension_tags() -> None:
+    text = GEDCOM_EXTTAG.replace("1 _FOO 23\n", "1 _FOO 23\n2 CONT 24\n")
+    events = list(gedcom7.events(io.BytesIO(text.encode("utf-8"))))
+    assert (
+        "start",
+        1,
+        None,
+        "http://example.com/placeholder",
+        None,
+        "23\n24",
+    ) in events
+
+
+def test_events_check_the_end_before_it_is_reached() -> None:
+    text = GEDCOM_MIN.replace("0 TRLR", "0 TRLR\n1 NOTE x")
+    seen: list[gedcom7.types.Event] = []
+    with pytest.raises(gedcom7.GedcomParseError, match="TRLR must have no payload"):
+        seen.extend(gedcom7.events(io.BytesIO(text.encode("utf-8"))))
+    assert seen[-2:] == [
+        ("end", 0, None, "HEAD", None, ""),
+        ("start", 0, None, "TRLR", None, ""),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("include", "exclude", "tags"),
+    [
+        ({"INDI"}, None, {"HEAD", "INDI", "TRLR"}),
+        (
+            None,
+            ["INDI", "FAM"],
+            {"HEAD", "OBJE", "REPO", "SNOTE", "SOUR", "SUBM", "TRLR"},
+        ),
+        ({"INDI", "FAM"}, {"FAM"}, {"HEAD", "INDI", "TRLR"}),
+    ],
+)
+@pytest.mark.parametrize("eol", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("size", [3, 7, 1 << 16])
+def test_selected_records_match_a_filtered_load(
+    monkeypatch: pytest.MonkeyPatch,
+    include: set[str] | None,
+    exclude: list[str] | None,
+    tags: set[str],
+    eol: str,
+    size: int,
+) -> None:
+    """Records are skipped alike whatever the line ends and however it is read."""
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", size)
+    filename = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+    data = filename.read_text(encoding="utf-8").replace("\n", eol)
+    expected = [record for record in gedcom7.loads(data) if record.tag in tags]
+    assert {record.tag for record in expected} == tags
+    stream = io.BytesIO(data.encode("utf-8"))
+    records = gedcom7.load(stream, include_records=include, exclude_records=exclude)
+    assert records == expected
+    assert gedcom7.loads(data, include_records=include, exclude_records=exclude) == (
+        expected
+    )
+
+
+def test_skipped_records_are_counted_in_line_numbers() -> None:
+    text = GEDCOM_EXTTAG.replace("0 TRLR", "0 @S1@ SNOTE x\n2 NOTE bad\n0 TRLR")
+    records = gedcom7.loads(text, include_records={"INDI"})
+    assert [record.tag for record in records] == ["HEAD", "INDI", "INDI", "TRLR"]
+    for eol in ("\n", "\r\n", "\r"):
+        with pytest.raises(gedcom7.GedcomParseError, match="level") as excinfo:
+            gedcom7.loads(text.replace("\n", eol), exclude_records={"INDI"})
+        assert excinfo.value.line == "2 NOTE bad"
+        assert excinfo.value.line_number == text.splitlines().index("2 NOTE bad") + 1
+
+
+def test_pointers_to_and_from_skipped_records_are_not_reported() -> None:
+    text = GEDCOM_EXTTAG.replace("0 TRLR", "0 @F1@ FAM\n1 HUSB @I1@\n0 TRLR")
+    records = gedcom7.loads(text, include_records={"FAM"})
+    assert [record.tag for record in records] == ["HEAD", "FAM", "TRLR"]
+    text = GEDCOM_EXTTAG.replace("@I2@ INDI", "@I3@ INDI")
+    with pytest.raises(gedcom7.GedcomParseError, match="pointer @I2@"):
+        gedcom7.loads(text)
+    assert len(gedcom7.loads(text, exclude_records={"INDI"})) == 2
+
+
+@pytest.mark.parametrize("name", ["_LOC", "http://example.com/loc"])
+def test_documented_extension_records_are_selected_by_tag_or_uri(name: str) -> None:
+    text = GEDCOM_EXTTAG.replace(
+        "2 TAG _FOO", "2 TAG _LOC http://example.com/loc\n2 TAG _FOO"
+    ).replace("0 TRLR", "0 @L1@ _LOC\n1 NAME Here\n0 TRLR")
+    tags = ["HEAD", "INDI", "INDI", "http://example.com/loc", "TRLR"]
+    assert [record.tag for record in gedcom7.loads(text)] == tags
+    included = gedcom7.loads(text, include_records={name})
+    assert [record.tag for record in included] == ["HEAD", tags[3], "TRLR"]
+    excluded = gedcom7.loads(text, exclude_records={name})
+    assert [record.tag for record in excluded] == tags[:3] + ["TRLR"]
+    stream = io.BytesIO(text.encode("utf-8"))
+    assert gedcom7.load(stream, exclude_records=[name]) == excluded
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 64])
+@pytest.mark.parametrize("eol", ["\n", "\r\n", "\r"])
+def test_lines_are_cut_alike_whatever_the_block_size(
+    monkeypatch: pytest.MonkeyPatch, size: int, eol: str
+) -> None:
+    filename = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+    data = filename.read_text(encoding="utf-8")
+    # separators str.splitlines would split at, but a GEDCOM line does not
+    data = data.replace("1 SEX F", "1 SEX F\n1 NOTE a\u2028b\n2 CONT c\u2029", 1)
+    expected = gedcom7.loads(data)
+    assert "1 NOTE a\u2028b\n2 CONT c\u2029\n" in gedcom7.dumps(expected)
+    monkeypatch.setattr(gedcom7.parser, "_BLOCK_SIZE", size)
+    assert gedcom7.loads(data.replace("\n", eol)) == expected
+    assert gedcom7.loads(data.replace("\n", eol), exclude_records={"INDI"}) == [
+        record for record in expected if record.tag != "INDI"
+    ]
+
+
+def test_tags_and_pointers_are_shared() -> None:
+    text = GEDCOM_EXTTAG.replace("1 SEX F", "1 SEX F\n1 ALIA @I2@")
+    indi1, indi2 = gedcom7.loads(text)[1:3]
+    assert indi1.tag is indi2.tag
+    assert indi1.children[0].pointer is indi2.children[1].pointer
+
+
+def test_intern_shares_repeated_payloads(monkeypatch: pytest.MonkeyPatch) -> None:
+    text = GEDCOM_EXTTAG.replace("1 SEX F", "1 SEX F\n1 _FOO 23")
+    records = gedcom7.loads(text)
+    assert records[1].children[1].text is not records[2].children[1].text
+    for size in (1, 1 << 16):
+        monkeypatch.setattr(gedcom7.parser, "_TEXTS_SIZE", size)
+        records = gedcom7.loads(text, intern=True)
+        assert records == gedcom7.loads(text)
+        shared = records[1].children[1].text is records[2].children[1].text
+        assert shared == (size > 1)
@@ -6,6 +6,7 @@ import pathlib
 import pytest
 
 import gedcom7
+import gedcom7.parser
 from gedcom7 import GedcomSerializeError, types
 
 HEAD = "0 HEAD\n1 GEDC\n2 VERS 7.0\n"
@@ -152,7 +153,7 @@ def test_text_mode_is_rejected() -> None:
     with pytest.raises(TypeError, match="binary mode"):
         gedcom7.dump(records, io.StringIO())  # type: ignore[arg-type]
     with pytest.raises(TypeError, match="binary mode"):
-        gedcom7.load(io.StringIO(HEAD + TRLR))  # type: ignore[arg-type]
+        gedcom7.load(io.StringIO(HEAD + TRLR))  # type: ignore[call-overload]
 
 
 def test_dump_writes_nothing_to_a_text_stream() -> None:
@@ -169,6 +170,33 @@ def test_invalid_utf8_rejected() -> None:
         gedcom7.load(io.BytesIO(b"0 HEAD\n1 NOTE \xff\xfe\n0 TRLR\n"))
 
 
+@pytest.mark.parametrize("chunk_size", [3, 8, 1 << 16])
+def test_invalid_utf8_reports_its_offset(
+    chunk_size: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The offset counts from the start of the stream, not of the chunk read."""
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", chunk_size)
+    data = b"0 HEAD\n1 NOTE caf\xc3\n0 TRLR\n"
+    with pytest.raises(gedcom7.GedcomParseError, match="0xc3 at offset 17"):
+        gedcom7.load(io.BytesIO(data))
+
+
+def test_load_reads_in_bounded_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The file is never read whole, so its bytes are never all held at once."""
+    monkeypatch.setattr(gedcom7.parser, "_CHUNK_SIZE", 64)
+    source = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+    reads: list[int] = []
+
+    class Reader(io.BytesIO):
+        def read(self, size: int | None = -1) -> bytes:
+            reads.append(-1 if size is None else size)
+            return super().read(size)
+
+    records = gedcom7.load(Reader(source.read_bytes()))
+    assert records == gedcom7.loads(source.read_text(encoding="utf-8"))
+    assert set(reads) == {64}
+
+
 @pytest.mark.parametrize("eol", ["\n", "\r\n", "\r"])
 def test_file_roundtrip_preserves_terminators(eol: str, tmp_path: pathlib.Path) -> None:
     """Going through the filesystem must not rewrite the line terminators.
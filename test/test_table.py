@@ -0,0 +1,74 @@
+import io
+import pathlib
+
+import pytest
+
+import gedcom7
+import gedcom7.table
+
+MAXIMAL = pathlib.Path(__file__).parent / "data" / "maximal70.ged"
+
+GEDCOM = """0 HEAD
+1 GEDC
+2 VERS 7.0
+1 SCHMA
+2 TAG _FOO http://example.com/foo
+0 @I1@ INDI
+1 NAME John /Doe/
+1 NOTE first
+2 CONT second
+1 _FOO x
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @VOID@
+0 TRLR
+"""
+
+
+def test_records_match_load() -> None:
+    table = gedcom7.table.load_path(MAXIMAL)
+    assert list(table.records()) == gedcom7.load_path(MAXIMAL)
+    with open(MAXIMAL, "rb") as fp:
+        assert list(gedcom7.table.load(fp).records()) == gedcom7.load_path(MAXIMAL)
+
+
+def test_columns() -> None:
+    table = gedcom7.table.loads(GEDCOM)
+    assert len(table) == 13
+    assert list(table.levels) == [0, 1, 2, 1, 2, 0, 1, 1, 1, 0, 1, 1, 0]
+    assert list(table.parents) == [-1, 0, 1, 0, 3, -1, 5, 5, 5, -1, 9, 9, -1]
+    assert [table.tags[tag] for tag in table.tag_ids][5:9] == [
+        "INDI",
+        "NAME",
+        "NOTE",
+        "http://example.com/foo",
+    ]
+    assert table.tag_id("HEAD") == 0
+    assert table.tag_id("DATE") == gedcom7.table.loads(GEDCOM).tag_id("DATE") > 0
+    assert table.tag_id("_BAR") == -1
+    assert table.payload(7) == "first\nsecond"
+    assert table.payload(5) == ""
+    husband = table.pointer_ids[10]
+    assert table.ids[husband] == "@I1@"
+    assert table.xref_ids[table.row("@I1@")] == husband
+    assert table.ids[table.pointer_ids[11]] == "@VOID@"
+    with pytest.raises(KeyError):
+        table.row("@VOID@")
+
+
+def test_structure_builds_a_subtree() -> None:
+    table = gedcom7.table.loads(GEDCOM)
+    records = gedcom7.loads(GEDCOM)
+    assert table.structure(table.row("@I1@")) == records[1]
+    note = table.structure(7)
+    assert note == records[1].children[1]
+    assert note.parent is None
+
+
+def test_errors_match_loads() -> None:
+    text = GEDCOM.replace("1 HUSB @I1@", "1 HUSB @I2@")
+    with pytest.raises(gedcom7.GedcomParseError, match="@I2@") as expected:
+        gedcom7.loads(text)
+    with pytest.raises(gedcom7.GedcomParseError, match="@I2@") as excinfo:
+        gedcom7.table.load(io.BytesIO(text.encode("utf-8")))
+    assert excinfo.value.line_number == expected.value.line_number
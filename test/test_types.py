@@ -1,6 +1,9 @@
 """Tests for structure type resolution and payload casting."""
 
+import dataclasses
 import logging
+import tracemalloc
+from collections.abc import Callable
 
 import pytest
 
@@ -135,3 +138,49 @@ def test_structure_children_are_not_shared_between_instances() -> None:
     first = types.GedcomStructure(tag="INDI")
     first.append_child(types.GedcomStructure(tag="SEX", text="M"))
     assert types.GedcomStructure(tag="INDI").children == []
+
+
+# --------------------------------------------------------------------------
+# Memory
+# --------------------------------------------------------------------------
+
+
+@dataclasses.dataclass
+class _UnslottedStructure:
+    """GedcomStructure's fields as a plain dataclass, with a __dict__ each."""
+
+    tag: str
+    pointer: str | None = None
+    text: str = ""
+    xref: str | None = None
+    children: list[types.GedcomStructure] = dataclasses.field(default_factory=list)
+    parent: types.GedcomStructure | None = None
+    dataset: object = None
+
+
+def _bytes_per_node(cls: Callable[..., object], count: int = 10_000) -> float:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        nodes = [cls(tag="DATE", text="1 JAN 2000") for _ in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(nodes) == count
+    return (after - before) / count
+
+
+def test_structures_have_no_instance_dict(
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Slotted structures hold their fields without a dict of their own each."""
+    structure = types.GedcomStructure(tag="DATE")
+    assert not hasattr(structure, "__dict__")
+    with pytest.raises(AttributeError):
+        structure.level = 2  # type: ignore[attr-defined]
+    unslotted = _bytes_per_node(_UnslottedStructure)
+    slotted = _bytes_per_node(types.GedcomStructure)
+    record_property("bytes_per_node_unslotted", round(unslotted))
+    record_property("bytes_per_node_slotted", round(slotted))
+    # the list of children is in both; the dict is only in the unslotted one
+    assert slotted < unslotted